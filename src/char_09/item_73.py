@@ -44,12 +44,7 @@ class Grid:
         self.rows[y % self.height][x % self.width] = state
 
     def __str__(self):
-        output = ""
-        for row in self.rows:
-            for cell in row:
-                output += cell
-            output += "\n"
-        return output
+        return "\n".join("".join(row) for row in self.rows) + "\n"
 
 
 class LockingGrid(Grid):
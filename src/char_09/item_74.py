@@ -5,21 +5,38 @@
 3. 展示错误示例（如直接创建线程）与正确示例（使用线程池）。
 4. 通过 `max_workers` 控制线程数量，避免内存暴涨问题。
 5. 结合《生命游戏》示例说明并发编程中的实际应用。
+6. 对纯计算的整网格更新，使用 Numba 编译并并行执行，绕开解释器和 GIL。
+7. 每个细胞只有一位状态，可按 64 个一组打包进 uint64，用位运算整行更新（SWAR）。
 
 该模块定义了多个函数来展示不同场景下的线程行为，并在 main 函数中统一运行所有示例。
 """
 
 import logging
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from threading import Lock
 
+import numpy as np
+from numba import njit, prange, get_num_threads
+
 # 配置日志记录
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 ALIVE = "*"
 EMPTY = "-"
 
+# 八个邻居相对于当前单元格的 (dy, dx) 偏移量，只在模块加载时创建一次
+_OFFSETS = (
+    (-1, 0),  # 北方
+    (-1, 1),  # 东北方
+    (0, 1),  # 东方
+    (1, 1),  # 东南方
+    (1, 0),  # 南方
+    (1, -1),  # 西南方
+    (0, -1),  # 西方
+    (-1, -1),  # 西北方
+)
+
 class Grid:
     """表示一个二维网格，用于模拟《生命游戏》的基本结构。"""
 
@@ -37,12 +54,7 @@ class Grid:
         self.rows[y % self.height][x % self.width] = state
 
     def __str__(self):
-        output = ""
-        for row in self.rows:
-            for cell in row:
-                output += cell
-            output += "\n"
-        return output
+        return "\n".join("".join(row) for row in self.rows) + "\n"
 
 
 class LockingGrid(Grid):
@@ -77,20 +89,7 @@ def count_neighbors(y, x, get_cell):
     返回:
         neighbors: 存活细胞的数量。
     """
-    n_ = get_cell(y - 1, x + 0)  # 北方
-    ne = get_cell(y - 1, x + 1)  # 东北方
-    e_ = get_cell(y + 0, x + 1)  # 东方
-    se = get_cell(y + 1, x + 1)  # 东南方
-    s_ = get_cell(y + 1, x + 0)  # 南方
-    sw = get_cell(y + 1, x - 1)  # 西南方
-    w_ = get_cell(y + 0, x - 1)  # 西方
-    nw = get_cell(y - 1, x - 1)  # 西北方
-    neighbor_states = [n_, ne, e_, se, s_, sw, w_, nw]
-    count = 0
-    for state in neighbor_states:
-        if state == ALIVE:
-            count += 1
-    return count
+    return sum(get_cell(y + dy, x + dx) == ALIVE for dy, dx in _OFFSETS)
 
 
 def game_logic(state, neighbors):
@@ -126,7 +125,8 @@ def step_cell(y, x, get_cell, set_cell):
         set_cell: 设置细胞状态的函数。
     """
     state = get_cell(y, x)
-    neighbors = count_neighbors(y, x, get_cell)
+    # 内联邻居计数，省去每个细胞一次 count_neighbors 调用
+    neighbors = sum(get_cell(y + dy, x + dx) == ALIVE for dy, dx in _OFFSETS)
     next_state = game_logic(state, neighbors)
     set_cell(y, x, next_state)
 
@@ -151,12 +151,221 @@ def simulate_pool(pool, grid):
             future = pool.submit(step_cell, *args)  # Fan-out
             futures.append(future)
 
-    for future in futures:
-        future.result()  # Fan-in
+    done, _ = wait(futures, return_when=FIRST_EXCEPTION)  # Fan-in
+    for future in done:
+        future.result()  # 重新抛出工作线程中的异常
+
+    return next_grid
+
+
+def step_row(y, src, dst, height, width):
+    """
+    在一个函数内完成整行细胞的读取、计算和写入。
+
+    直接使用行列表作为局部变量，循环内没有 get/set、count_neighbors
+    和 game_logic 的方法调用开销。
+
+    参数:
+        y: 行号。
+        src: 当前网格的 rows。
+        dst: 下一步网格的 rows，每个任务只写自己的那一行。
+        height: 网格高度。
+        width: 网格宽度。
+    """
+    up = src[(y - 1) % height]
+    row = src[y]
+    down = src[(y + 1) % height]
+    out = dst[y]
+    for x in range(width):
+        left = (x - 1) % width
+        right = (x + 1) % width
+        n = ((up[left] == ALIVE) + (up[x] == ALIVE) + (up[right] == ALIVE)
+             + (row[left] == ALIVE) + (row[right] == ALIVE)
+             + (down[left] == ALIVE) + (down[x] == ALIVE) + (down[right] == ALIVE))
+        if n == 3 or (n == 2 and row[x] == ALIVE):
+            out[x] = ALIVE
+        else:
+            out[x] = EMPTY
+
+
+def simulate_pool_rows(pool, grid):
+    """
+    按行批量提交任务，每行一个 future，而不是每个细胞一个。
+
+    参数:
+        pool: 用于提交任务的线程池。
+        grid: 当前的网格实例。
+
+    返回:
+        next_grid: 更新后的网格实例。
+    """
+    next_grid = Grid(grid.height, grid.width)
+
+    futures = []
+    for y in range(grid.height):
+        args = (y, grid.rows, next_grid.rows, grid.height, grid.width)
+        futures.append(pool.submit(step_row, *args))  # Fan-out
+
+    done, _ = wait(futures, return_when=FIRST_EXCEPTION)  # Fan-in
+    for future in done:
+        future.result()
 
     return next_grid
 
 
+@njit(parallel=True, cache=True)
+def step_grid(a, out):
+    """
+    使用 Numba 编译的整网格更新，按行通过 prange 并行。
+
+    参数:
+        a: 当前网格的 uint8 数组，1 表示存活，0 表示死亡。
+        out: 写入下一步状态的同形状数组。
+    """
+    height, width = a.shape
+    for y in prange(height):
+        up = (y - 1) % height
+        down = (y + 1) % height
+        for x in range(width):
+            left = (x - 1) % width
+            right = (x + 1) % width
+            n = (a[up, x] + a[up, right] + a[y, right] + a[down, right]
+                 + a[down, x] + a[down, left] + a[y, left] + a[up, left])
+            if a[y, x]:
+                out[y, x] = 1 if 2 <= n <= 3 else 0
+            else:
+                out[y, x] = 1 if n == 3 else 0
+
+
+def grid_to_array(grid):
+    """将 Grid 转换为 uint8 数组，供 step_grid 使用。"""
+    a = np.zeros((grid.height, grid.width), dtype=np.uint8)
+    for y, row in enumerate(grid.rows):
+        for x, state in enumerate(row):
+            if state == ALIVE:
+                a[y, x] = 1
+    return a
+
+
+def array_to_grid(a, grid_cls=Grid):
+    """将 step_grid 输出的数组转换回 Grid。"""
+    height, width = a.shape
+    grid = grid_cls(height, width)
+    for y in range(height):
+        for x in range(width):
+            if a[y, x]:
+                grid.set(y, x, ALIVE)
+    return grid
+
+
+def simulate_numba(grid):
+    """
+    使用 Numba 并行内核更新整个网格的状态。
+
+    线程数由环境变量 NUMBA_NUM_THREADS 决定（默认等于 CPU 核数）。
+
+    参数:
+        grid: 当前的网格实例。
+
+    返回:
+        next_grid: 更新后的网格实例。
+    """
+    a = grid_to_array(grid)
+    out = np.empty_like(a)
+    step_grid(a, out)
+    return array_to_grid(out, type(grid))
+
+
+def pack_array(a):
+    """将 step_grid 使用的 uint8 数组按每 64 个细胞打包成一个 uint64。"""
+    height, width = a.shape
+    words = (width + 63) // 64
+    padded = np.zeros((height, words * 64), dtype=np.uint8)
+    padded[:, :width] = a
+    packed = np.packbits(padded, axis=1, bitorder="little")
+    return packed.view("<u8").astype(np.uint64)
+
+
+def unpack_array(p, width):
+    """pack_array 的逆操作，返回 (height, width) 的 uint8 数组。"""
+    bits = np.ascontiguousarray(p.astype("<u8")).view(np.uint8)
+    return np.unpackbits(bits, axis=1, bitorder="little")[:, :width]
+
+
+def _shift_west(p, width):
+    """返回第 x 位等于原来第 x-1 位的位平面（环绕到 width-1）。"""
+    last = width - 1
+    out = p << np.uint64(1)
+    out[:, 1:] |= p[:, :-1] >> np.uint64(63)
+    out[:, 0] |= (p[:, last // 64] >> np.uint64(last % 64)) & np.uint64(1)
+    return out
+
+
+def _shift_east(p, width):
+    """返回第 x 位等于原来第 x+1 位的位平面（环绕到 0）。"""
+    last = width - 1
+    out = p >> np.uint64(1)
+    out[:, :-1] |= p[:, 1:] << np.uint64(63)
+    out[:, last // 64] |= (p[:, 0] & np.uint64(1)) << np.uint64(last % 64)
+    return out
+
+
+def _full_add(a, b, c):
+    """逐位全加器，返回 (和, 进位)。"""
+    t = a ^ b
+    return t ^ c, (a & b) | (t & c)
+
+
+def step_grid_packed(p, width):
+    """
+    对打包后的网格执行一步更新，一次位运算同时处理 64 个细胞。
+
+    参数:
+        p: pack_array 返回的 (height, words) uint64 数组。
+        width: 网格的实际宽度。
+
+    返回:
+        下一步状态的打包数组。
+    """
+    mask = np.full(p.shape[1], np.iinfo(np.uint64).max, dtype=np.uint64)
+    if width % 64:
+        mask[-1] = np.uint64((1 << (width % 64)) - 1)
+
+    up = np.roll(p, 1, axis=0)
+    down = np.roll(p, -1, axis=0)
+    planes = [
+        up, _shift_east(up, width), _shift_east(p, width), _shift_east(down, width),
+        down, _shift_west(down, width), _shift_west(p, width), _shift_west(up, width),
+    ]
+
+    # 把八个邻居位平面折叠成每个细胞一个 4 位的计数 (bit3 bit2 bit1 bit0)
+    s_a, c_a = _full_add(planes[0], planes[1], planes[2])
+    s_b, c_b = _full_add(planes[3], planes[4], planes[5])
+    s_c, c_c = planes[6] ^ planes[7], planes[6] & planes[7]
+    bit0, c_d = _full_add(s_a, s_b, s_c)
+    t, c_e = _full_add(c_a, c_b, c_c)
+    bit1, c_f = t ^ c_d, t & c_d
+    high = c_e | c_f  # bit2 或 bit3 置位，表示邻居数 >= 4
+
+    # 邻居数为 3，或者邻居数为 2 且当前存活
+    return bit1 & ~high & (bit0 | p) & mask
+
+
+def simulate_swar(grid):
+    """
+    使用 SWAR 位运算更新整个网格的状态。
+
+    参数:
+        grid: 当前的网格实例。
+
+    返回:
+        next_grid: 更新后的网格实例。
+    """
+    packed = pack_array(grid_to_array(grid))
+    out = unpack_array(step_grid_packed(packed, grid.width), grid.width)
+    return array_to_grid(out, type(grid))
+
+
 def naive_threading_example():
     """
     错误示例：直接为每个单元格创建新线程。
@@ -239,6 +448,57 @@ def limited_parallelism_issue():
     logging.info("模拟耗时 %.2f 秒，网格大小 %d x %d", end_time - start_time, large_grid.height, large_grid.width)
 
 
+def row_batched_example():
+    """
+    正确示例：按行批量提交，并在单个函数内融合读取、计算和写入。
+    """
+    logging.info("开始按行批量示例")
+    large_grid = LockingGrid(100, 100)
+    for i in range(100):
+        large_grid.set(i // 10, i % 10, ALIVE)
+
+    start_time = time.time()
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        next_grid = simulate_pool_rows(executor, large_grid)
+    end_time = time.time()
+
+    logging.info("模拟耗时 %.4f 秒，网格大小 %d x %d", end_time - start_time, next_grid.height, next_grid.width)
+
+
+def numba_parallel_example():
+    """
+    正确示例：纯计算的网格更新交给 Numba 编译的并行内核。
+    """
+    logging.info("开始 Numba 并行示例，线程数: %d", get_num_threads())
+    large_grid = LockingGrid(100, 100)
+    for i in range(100):
+        large_grid.set(i // 10, i % 10, ALIVE)
+
+    simulate_numba(large_grid)  # 预热，触发 JIT 编译或加载缓存
+
+    start_time = time.time()
+    next_grid = simulate_numba(large_grid)
+    end_time = time.time()
+
+    logging.info("模拟耗时 %.4f 秒，网格大小 %d x %d", end_time - start_time, next_grid.height, next_grid.width)
+
+
+def swar_example():
+    """
+    正确示例：把 64 个细胞打包进一个 uint64，用位运算整行更新。
+    """
+    logging.info("开始 SWAR 位运算示例")
+    large_grid = LockingGrid(100, 100)
+    for i in range(100):
+        large_grid.set(i // 10, i % 10, ALIVE)
+
+    start_time = time.time()
+    next_grid = simulate_swar(large_grid)
+    end_time = time.time()
+
+    logging.info("模拟耗时 %.4f 秒，网格大小 %d x %d", end_time - start_time, next_grid.height, next_grid.width)
+
+
 def main():
     """
     主函数，运行所有示例。
@@ -257,6 +517,15 @@ def main():
     logging.info("\n--- 线程池限制示例 ---")
     limited_parallelism_issue()
 
+    logging.info("\n--- 按行批量示例 ---")
+    row_batched_example()
+
+    logging.info("\n--- Numba 并行示例 ---")
+    numba_parallel_example()
+
+    logging.info("\n--- SWAR 位运算示例 ---")
+    swar_example()
+
     logging.info("所有示例运行完毕")
 
 
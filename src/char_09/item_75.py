@@ -10,6 +10,7 @@
 """
 
 import asyncio
+import itertools
 import logging
 
 # 配置日志系统
@@ -19,6 +20,39 @@ logger = logging.getLogger(__name__)
 ALIVE = "*"
 EMPTY = "-"
 
+# 八个邻居的 (dy, dx) 偏移量，只在模块加载时创建一次
+_OFFSETS = (
+    (-1, 0),  # North
+    (-1, 1),  # Northeast
+    (0, 1),  # East
+    (1, 1),  # Southeast
+    (1, 0),  # South
+    (1, -1),  # Southwest
+    (0, -1),  # West
+    (-1, -1),  # Northwest
+)
+
+# 同时存活的协程数量上限：固定数量的工作协程依次领取单元格，
+# 避免大网格一次性创建成千上万个任务
+MAX_CONCURRENT_TASKS = 256
+
+
+async def run_cells(grid, next_grid, step):
+    """
+    用最多 MAX_CONCURRENT_TASKS 个工作协程处理网格中的全部单元格
+
+    所有工作协程共享同一个单元格迭代器，任务数量与网格大小无关
+    """
+    cells = itertools.product(range(grid.height), range(grid.width))
+
+    async def worker():
+        for y, x in cells:
+            await step(y, x, grid.get, next_grid.set)
+
+    async with asyncio.TaskGroup() as group:
+        for _ in range(min(MAX_CONCURRENT_TASKS, grid.height * grid.width)):
+            group.create_task(worker())
+
 
 class Grid:
     def __init__(self, height, width):
@@ -35,29 +69,11 @@ class Grid:
         self.rows[y % self.height][x % self.width] = state
 
     def __str__(self):
-        output = ""
-        for row in self.rows:
-            for cell in row:
-                output += cell
-            output += "\n"
-        return output
+        return "\n".join("".join(row) for row in self.rows) + "\n"
 
 
 def count_neighbors(y, x, get_cell):
-    n_ = get_cell(y - 1, x + 0)  # North
-    ne = get_cell(y - 1, x + 1)  # Northeast
-    e_ = get_cell(y + 0, x + 1)  # East
-    se = get_cell(y + 1, x + 1)  # Southeast
-    s_ = get_cell(y + 1, x + 0)  # South
-    sw = get_cell(y + 1, x - 1)  # Southwest
-    w_ = get_cell(y + 0, x - 1)  # West
-    nw = get_cell(y - 1, x - 1)  # Northwest
-    neighbor_states = [n_, ne, e_, se, s_, sw, w_, nw]
-    count = 0
-    for state in neighbor_states:
-        if state == ALIVE:
-            count += 1
-    return count
+    return sum(get_cell(y + dy, x + dx) == ALIVE for dy, dx in _OFFSETS)
 
 
 class ColumnPrinter:
@@ -104,7 +120,8 @@ async def game_logic_without_io(state, neighbors):
 async def step_cell_without_io(y, x, get_cell, set_cell):
     """一个没有IO操作的step_cell协程示例"""
     state = get_cell(y, x)
-    neighbors = count_neighbors(y, x, get_cell)
+    # 内联邻居计数，省去每个细胞一次 count_neighbors 调用
+    neighbors = sum(get_cell(y + dy, x + dx) == ALIVE for dy, dx in _OFFSETS)
     next_state = await game_logic_without_io(state, neighbors)
     set_cell(y, x, next_state)
 
@@ -152,8 +169,9 @@ def correct_example_without_io():
     """
     正确示例：使用asyncio.run正确执行协程
 
-    这个示例展示了如何使用asyncio.run正确执行协程，
-    并在主线程中驱动事件循环。
+    这个示例展示了如何正确执行协程，并在主线程中驱动事件循环。
+    asyncio.Runner让每一代模拟复用同一个事件循环，
+    而不是像asyncio.run那样每次都新建并关闭一个。
     """
     logger.info("正确示例：使用asyncio.run正确执行协程")
 
@@ -165,10 +183,11 @@ def correct_example_without_io():
     grid.set(2, 4, ALIVE)
 
     columns = ColumnPrinter()
-    for i in range(5):
-        columns.append(str(grid))
-        # 正确：使用asyncio.run执行主协程
-        grid = asyncio.run(simulate_without_io(grid))
+    with asyncio.Runner() as runner:
+        for i in range(5):
+            columns.append(str(grid))
+            # 正确：在同一个事件循环中执行主协程
+            grid = runner.run(simulate_without_io(grid))
 
     logger.info("模拟完成，最终状态:\n%s", columns)
 
@@ -189,7 +208,8 @@ async def game_logic_with_io(state, neighbors):
 async def step_cell_with_io(y, x, get_cell, set_cell):
     """一个带有IO操作的step_cell协程示例"""
     state = get_cell(y, x)
-    neighbors = count_neighbors(y, x, get_cell)
+    # 内联邻居计数，省去每个细胞一次 count_neighbors 调用
+    neighbors = sum(get_cell(y + dy, x + dx) == ALIVE for dy, dx in _OFFSETS)
     next_state = await game_logic_with_io(state, neighbors)
     set_cell(y, x, next_state)
 
@@ -197,14 +217,7 @@ async def step_cell_with_io(y, x, get_cell, set_cell):
 async def simulate_with_io(grid: Grid) -> Grid:
     """一个带有IO操作的simulate协程示例"""
     next_grid = Grid(grid.height, grid.width)
-
-    tasks = []
-    for y in range(grid.height):
-        for x in range(grid.width):
-            task = step_cell_with_io(y, x, grid.get, next_grid.set)
-            tasks.append(task)
-
-    await asyncio.gather(*tasks)
+    await run_cells(grid, next_grid, step_cell_with_io)
     return next_grid
 
 
@@ -225,38 +238,25 @@ def correct_example_with_io():
     grid.set(2, 4, ALIVE)
 
     columns = ColumnPrinter()
-    for i in range(5):
-        columns.append(str(grid))
-        grid = asyncio.run(simulate_with_io(grid))
+    with asyncio.Runner() as runner:
+        for i in range(5):
+            columns.append(str(grid))
+            grid = runner.run(simulate_with_io(grid))
 
     logger.info("模拟完成，最终状态:\n%s", columns)
 
 
-async def count_neighbors_with_io(y, x, get_cell):
-    """一个带有IO操作的count_neighbors协程示例"""
-    # 模拟IO操作，比如从网络获取邻居状态
-    await asyncio.sleep(0)  # 模拟IO操作
-
-    n_ = get_cell(y - 1, x + 0)  # North
-    ne = get_cell(y - 1, x + 1)  # Northeast
-    e_ = get_cell(y + 0, x + 1)  # East
-    se = get_cell(y + 1, x + 1)  # Southeast
-    s_ = get_cell(y + 1, x + 0)  # South
-    sw = get_cell(y + 1, x - 1)  # Southwest
-    w_ = get_cell(y + 0, x - 1)  # West
-    nw = get_cell(y - 1, x - 1)  # Northwest
-    neighbor_states = [n_, ne, e_, se, s_, sw, w_, nw]
-    count = 0
-    for state in neighbor_states:
-        if state == ALIVE:
-            count += 1
-    return count
+def count_neighbors_with_io(y, x, get_cell):
+    """一个预留IO位置的count_neighbors示例"""
+    # 这里没有真正的IO，asyncio.sleep(0)只会让每个单元格多一次事件循环调度；
+    # 等到确实需要 await reader.read(...) 时再改回 async def
+    return sum(get_cell(y + dy, x + dx) == ALIVE for dy, dx in _OFFSETS)
 
 
 async def step_cell_with_io_in_neighbors(y, x, get_cell, set_cell):
     """一个在count_neighbors中使用IO的step_cell协程示例"""
     state = get_cell(y, x)
-    neighbors = await count_neighbors_with_io(y, x, get_cell)
+    neighbors = count_neighbors_with_io(y, x, get_cell)
     next_state = await game_logic_without_io(state, neighbors)
     set_cell(y, x, next_state)
 
@@ -264,14 +264,7 @@ async def step_cell_with_io_in_neighbors(y, x, get_cell, set_cell):
 async def simulate_with_io_in_neighbors(grid: Grid) -> Grid:
     """一个在count_neighbors中使用IO的simulate协程示例"""
     next_grid = Grid(grid.height, grid.width)
-
-    tasks = []
-    for y in range(grid.height):
-        for x in range(grid.width):
-            task = step_cell_with_io_in_neighbors(y, x, grid.get, next_grid.set)
-            tasks.append(task)
-
-    await asyncio.gather(*tasks)
+    await run_cells(grid, next_grid, step_cell_with_io_in_neighbors)
     return next_grid
 
 
@@ -292,9 +285,10 @@ def example_with_io_in_neighbors():
     grid.set(2, 4, ALIVE)
 
     columns = ColumnPrinter()
-    for i in range(5):
-        columns.append(str(grid))
-        grid = asyncio.run(simulate_with_io_in_neighbors(grid))
+    with asyncio.Runner() as runner:
+        for i in range(5):
+            columns.append(str(grid))
+            grid = runner.run(simulate_with_io_in_neighbors(grid))
 
     logger.info("模拟完成，最终状态:\n%s", columns)
 
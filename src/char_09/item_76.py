@@ -19,6 +19,8 @@ import time
 from threading import Thread
 from contextlib import contextmanager, asynccontextmanager
 import math
+import multiprocessing
+import os
 
 # 配置日志记录
 logging.basicConfig(
@@ -34,6 +36,14 @@ SAME = "Same"
 UNSURE = "Unsure"
 CORRECT = "Correct"
 
+# 热路径上发送的固定命令预先编码为bytes，避免每次拼接字符串再encode
+NUMBER_COMMAND = b"NUMBER\n"
+CLEAR_COMMAND = b"CLEAR\n"
+REPORT_COMMANDS = {
+    decision: f"REPORT {decision}\n".encode()
+    for decision in (WARMER, COLDER, SAME, UNSURE, CORRECT)
+}
+
 
 # ========================
 # 原始线程版实现
@@ -49,20 +59,39 @@ class Connection:
 
     def __init__(self, connection):
         self.connection = connection
-        self.file = connection.makefile("rb")
-
-    def send(self, command):
-        """发送命令"""
-        line = command + "\n"
-        data = line.encode()
+        # 复用同一块接收缓冲区，[_start, _end) 为尚未消费的数据
+        self._buf = bytearray(4096)
+        self._view = memoryview(self._buf)
+        self._start = 0
+        self._end = 0
+
+    def send(self, data):
+        """发送已编码、以换行结尾的命令"""
         self.connection.send(data)
 
     def receive(self):
         """接收响应"""
-        line = self.file.readline()
-        if not line:
+        while (index := self._buf.find(b"\n", self._start, self._end)) < 0:
+            self._fill()
+        line = self._buf[self._start:index].decode()
+        self._start = index + 1
+        return line
+
+    def _fill(self):
+        """把未消费的数据移到缓冲区开头，再用recv_into读入一整块"""
+        remaining = self._end - self._start
+        if self._start:
+            self._buf[:remaining] = self._buf[self._start:self._end]
+            self._start, self._end = 0, remaining
+        if self._end == len(self._buf):
+            # 单行超过缓冲区大小时扩容
+            self._view.release()
+            self._buf.extend(bytes(len(self._buf)))
+            self._view = memoryview(self._buf)
+        count = self.connection.recv_into(self._view[self._end:])
+        if not count:
             raise EOFError("Connection closed")
-        return line[:-1].decode()
+        self._end += count
 
 
 class UnknownCommandError(Exception):
@@ -103,16 +132,25 @@ class ServerSession(Connection):
         if self.secret is not None:
             return self.secret
 
-        while True:
-            guess = random.randint(self.lower, self.upper)
-            if guess not in self.guesses:
-                return guess
+        # 猜过的数字不足范围的一半时直接拒绝采样，平均重试不到两次；
+        # 大部分数字都已猜过时才构建剩余数字列表，从中一次抽取
+        if len(self._guess_set) * 2 < self.upper - self.lower + 1:
+            while (guess := random.randint(self.lower, self.upper)) in self._guess_set:
+                pass
+            return guess
+
+        remaining = [
+            number for number in range(self.lower, self.upper + 1)
+            if number not in self._guess_set
+        ]
+        return random.choice(remaining)
 
     def send_number(self):
         """发送猜测结果"""
         guess = self.next_guess()
         self.guesses.append(guess)
-        self.send(str(guess))
+        self._guess_set.add(guess)
+        self.send(b"%d\n" % guess)
 
     def receive_report(self, decision):
         """接收报告结果"""
@@ -127,13 +165,14 @@ class ServerSession(Connection):
         self.upper = None
         self.secret = None
         self.guesses = []
+        self._guess_set = set()
 
 
 @contextmanager
 def new_game(connection, lower, upper, secret):
     """启动新游戏上下文管理器"""
     logger.info(f"Guess a number between {lower} and {upper}! Shhhhh, it's {secret}.")
-    connection.send(f"PARAMS {lower} {upper}")
+    connection.send(b"PARAMS %d %d\n" % (lower, upper))
     try:
         yield ClientSession(
             connection.send,
@@ -143,7 +182,7 @@ def new_game(connection, lower, upper, secret):
     finally:
         # 等待确保输出顺序
         time.sleep(0.1)
-        connection.send("CLEAR")
+        connection.send(CLEAR_COMMAND)
 
 
 class ClientSession:
@@ -157,7 +196,7 @@ class ClientSession:
 
     def request_number(self):
         """请求猜测"""
-        self.send("NUMBER")
+        self.send(NUMBER_COMMAND)
         data = self.receive()
         return int(data)
 
@@ -177,7 +216,7 @@ class ClientSession:
             decision = SAME
 
         self.last_distance = new_distance
-        self.send(f"REPORT {decision}")
+        self.send(REPORT_COMMANDS[decision])
         return decision
 
     def __iter__(self):
@@ -254,13 +293,19 @@ class AsyncConnection:
         self.reader = reader
         self.writer = writer
 
-    async def send(self, command):
-        """异步发送命令"""
-        line = command + "\n"
-        data = line.encode()
+    async def send(self, data):
+        """异步发送已编码、以换行结尾的命令"""
         self.writer.write(data)
         await self.writer.drain()
 
+    async def send_nowait(self, data):
+        """写入命令但不等待drain，由调用方在合适的边界调用flush"""
+        self.writer.write(data)
+
+    async def flush(self):
+        """等待写缓冲区排空"""
+        await self.writer.drain()
+
     async def receive(self):
         """异步接收响应"""
         line = await self.reader.readline()
@@ -302,16 +347,25 @@ class AsyncServerSession(AsyncConnection):
         if self.secret is not None:
             return self.secret
 
-        while True:
-            guess = random.randint(self.lower, self.upper)
-            if guess not in self.guesses:
-                return guess
+        # 猜过的数字不足范围的一半时直接拒绝采样，平均重试不到两次；
+        # 大部分数字都已猜过时才构建剩余数字列表，从中一次抽取
+        if len(self._guess_set) * 2 < self.upper - self.lower + 1:
+            while (guess := random.randint(self.lower, self.upper)) in self._guess_set:
+                pass
+            return guess
+
+        remaining = [
+            number for number in range(self.lower, self.upper + 1)
+            if number not in self._guess_set
+        ]
+        return random.choice(remaining)
 
     async def send_number(self):
         """异步发送猜测"""
         guess = self.next_guess()
         self.guesses.append(guess)
-        await self.send(str(guess))
+        self._guess_set.add(guess)
+        await self.send(b"%d\n" % guess)
 
     def receive_report(self, decision):
         """接收报告结果"""
@@ -326,23 +380,27 @@ class AsyncServerSession(AsyncConnection):
         self.upper = None
         self.secret = None
         self.guesses = []
+        self._guess_set = set()
 
 
 @asynccontextmanager
 async def new_async_game(connection, lower, upper, secret):
     """异步启动新游戏"""
     logger.info(f"Guess a number between {lower} and {upper}! Shhhhh, it's {secret}.")
-    await connection.send(f"PARAMS {lower} {upper}")
+    await connection.send(b"PARAMS %d %d\n" % (lower, upper))
     try:
+        # 每轮猜测的NUMBER/REPORT只写入缓冲区，紧随其后的receive会让出事件循环，
+        # 不必每条命令都drain一次
         yield AsyncClientSession(
-            connection.send,
+            connection.send_nowait,
             connection.receive,
             secret,
         )
     finally:
         # 等待确保输出顺序
         await asyncio.sleep(0.1)
-        await connection.send("CLEAR")
+        await connection.send_nowait(CLEAR_COMMAND)
+        await connection.flush()
 
 
 class AsyncClientSession:
@@ -356,7 +414,7 @@ class AsyncClientSession:
 
     async def request_number(self):
         """异步请求猜测"""
-        await self.send("NUMBER")
+        await self.send(NUMBER_COMMAND)
         data = await self.receive()
         return int(data)
 
@@ -376,7 +434,7 @@ class AsyncClientSession:
             decision = SAME
 
         self.last_distance = new_distance
-        await self.send(f"REPORT {decision}")
+        await self.send(REPORT_COMMANDS[decision])
         return decision
 
     async def __aiter__(self):
@@ -398,21 +456,77 @@ async def handle_async_connection(reader, writer):
         pass
 
 
-async def run_async_server(address):
-    """运行异步服务器"""
+def create_listener(address, backlog=1024):
+    """创建开启SO_REUSEPORT的监听套接字，多个进程可以绑定同一地址，由内核分摊accept"""
+    listener = socket.socket()
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if hasattr(socket, "SO_REUSEPORT"):  # Windows不支持
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    listener.bind(address)
+    listener.listen(backlog)
+    listener.setblocking(False)
+    return listener
+
+
+async def run_async_server(address, backlog=1024, ready=None):
+    """
+    运行异步服务器
+
+    ready 是可选的事件对象（asyncio.Event 或 multiprocessing.Event），
+    监听套接字开始 listen() 后调用其 set()，通知客户端可以连接
+    """
     server = await asyncio.start_server(
-        handle_async_connection, *address
+        handle_async_connection,
+        sock=create_listener(address, backlog),
+        backlog=backlog,
     )
     logger.info(f"Async server started on {address}")
+    if ready is not None:
+        ready.set()
     async with server:
         await server.serve_forever()
 
 
-async def run_async_client(address):
-    """运行异步客户端"""
-    # 等待服务器启动
-    await asyncio.sleep(0.1)
+def serve_async_worker(address, ready):
+    """在子进程中运行一个独立的事件循环和监听套接字，开始监听后设置 ready"""
+    try:
+        asyncio.run(run_async_server(address, ready=ready))
+    except KeyboardInterrupt:
+        pass
+
+
+def start_async_server_processes(address, workers=None):
+    """
+    启动多个服务器进程，每个进程各自监听同一地址
+
+    单个进程的回调代码受GIL限制，多进程加SO_REUSEPORT才能让accept和处理随核数扩展。
+    返回进程列表和对应的就绪事件，每个进程开始监听后设置自己的事件。
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    processes = []
+    ready_events = []
+    for _ in range(workers):
+        ready = multiprocessing.Event()
+        process = multiprocessing.Process(
+            target=serve_async_worker, args=(address, ready), daemon=True
+        )
+        process.start()
+        processes.append(process)
+        ready_events.append(ready)
+    return processes, ready_events
+
+
+def wait_until_ready(ready_events, timeout=10):
+    """等待所有服务器进程开始监听，超时仍未就绪则抛出 RuntimeError"""
+    deadline = time.monotonic() + timeout
+    for ready in ready_events:
+        if not ready.wait(max(deadline - time.monotonic(), 0)):
+            raise RuntimeError("服务器进程未能在超时时间内开始监听")
+
 
+async def run_async_client(address):
+    """运行异步客户端，调用方需保证服务器已经开始监听"""
     streams = await asyncio.open_connection(*address)
     client = AsyncConnection(*streams)
 
@@ -444,8 +558,10 @@ async def main_async():
     """异步主函数"""
     address = ("127.0.0.1", 4321)
 
-    # 创建并启动服务器任务
-    server_task = asyncio.create_task(run_async_server(address))
+    # 创建并启动服务器任务，等它开始监听后再连接
+    ready = asyncio.Event()
+    server_task = asyncio.create_task(run_async_server(address, ready=ready))
+    await ready.wait()
 
     # 运行客户端
     results = await run_async_client(address)
@@ -462,6 +578,22 @@ async def main_async():
         pass
 
 
+async def main_async_multi_process():
+    """多进程异步服务器示例"""
+    address = ("127.0.0.1", 4322)
+    processes, ready_events = start_async_server_processes(address, workers=2)
+    try:
+        # 在线程中阻塞等待就绪事件，不占用事件循环
+        await asyncio.to_thread(wait_until_ready, ready_events)
+        results = await run_async_client(address)
+        for number, outcome in results:
+            logger.info(f"Multi-process Client: {number} is {outcome}")
+    finally:
+        for process in processes:
+            process.terminate()
+            process.join()
+
+
 def main():
     """主函数运行完整示例"""
     logger.info("=== 启动同步服务器测试 ===")
@@ -488,6 +620,13 @@ def main():
     except Exception as e:
         logger.error(f"异步测试出错: {e}")
 
+    if hasattr(socket, "SO_REUSEPORT"):
+        logger.info("=== 启动多进程异步服务器测试 ===")
+        try:
+            asyncio.run(main_async_multi_process())
+        except Exception as e:
+            logger.error(f"多进程异步测试出错: {e}")
+
 
 # ========================
 # 错误示例演示
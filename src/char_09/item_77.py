@@ -14,7 +14,12 @@ import time
 from threading import Lock, Thread
 from threading import current_thread
 import asyncio
+import ctypes
 import os
+import select
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 # 配置 logging
 logging.basicConfig(
@@ -28,33 +33,115 @@ class NoNewData(Exception):
     pass
 
 
-def readline(handle):
+def read_chunk(fd, size=65536):
     """
-    从文件中读取下一行，若无新数据则抛出 NoNewData 异常
-    """
-    offset = handle.tell()
-    handle.seek(0, 2)
-    length = handle.tell()
+    从文件描述符当前位置一次读取一整块新数据，若无新数据则抛出 NoNewData 异常
 
-    if length == offset:
+    每次唤醒只需要一次 os.read 系统调用，不经过缓冲 I/O 层，也不再逐行 tell/seek
+    """
+    data = os.read(fd, size)
+    if not data:
         raise NoNewData
+    return data
+
+
+def open_tail_fd(handle):
+    """
+    为 handle 对应的文件单独打开一个只读描述符，并定位到 handle 当前的偏移量
+
+    尾随循环内只对这个描述符调用 os.read；它独立于 handle 的文件描述，
+    handle 被关闭时 inotify 仍会收到 IN_CLOSE_NOWRITE，也不会读到被复用的描述符
+    """
+    fd = os.open(handle.name, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+    os.lseek(fd, os.lseek(handle.fileno(), 0, os.SEEK_CUR), os.SEEK_SET)
+    return fd
+
+
+def split_lines(pending, chunk):
+    """
+    把新读到的数据追加到 pending 缓冲区，以列表形式返回其中所有完整的行，
+    最后一个不完整的行留在 pending 中等待后续数据
+    """
+    pending.extend(chunk)
+    end = pending.rfind(b"\n") + 1
+    lines = bytes(pending[:end]).splitlines(keepends=True)
+    del pending[:end]
+    return lines
+
 
-    handle.seek(offset, 0)
-    return handle.readline()
+# inotify 事件掩码：文件被写入，或者文件的只读句柄被关闭（用于及时发现 handle.closed）
+IN_MODIFY = 0x00000002
+IN_CLOSE_NOWRITE = 0x00000010
+
+# Linux 上在导入时解析一次 libc（CDLL(None) 直接使用进程已加载的符号），
+# 避免每次创建监听都调用会启动子进程的 ctypes.util.find_library，阻塞事件循环
+_LIBC = ctypes.CDLL(None, use_errno=True) if sys.platform.startswith("linux") else None
+
+
+def inotify_watch(path):
+    """
+    在 Linux 上为 path 创建一个非阻塞的 inotify 文件描述符，
+    文件有新数据写入时该描述符变为可读；其他平台返回 None，调用方退回到轮询
+    """
+    if _LIBC is None:
+        return None
+    watch_fd = _LIBC.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    if watch_fd < 0:
+        return None
+    if _LIBC.inotify_add_watch(watch_fd, os.fsencode(path), IN_MODIFY | IN_CLOSE_NOWRITE) < 0:
+        os.close(watch_fd)
+        return None
+    return watch_fd
+
+
+def drain_events(watch_fd):
+    """读空 inotify 事件队列，只关心“有变化”，不解析具体事件"""
+    try:
+        while os.read(watch_fd, 4096):
+            pass
+    except BlockingIOError:
+        pass
+
+
+async def wait_for_change(loop, watch_fd):
+    """通过 loop.add_reader 等待 inotify 描述符可读，期间不产生任何轮询"""
+    future = loop.create_future()
+    loop.add_reader(watch_fd, lambda: future.done() or future.set_result(None))
+    try:
+        await future
+    finally:
+        loop.remove_reader(watch_fd)
+    drain_events(watch_fd)
 
 
 def tail_file(handle, interval, write_func):
     """
     线程版：持续监听文件尾部并调用回调函数处理新数据
+
+    write_func 每次接收一批完整的行（bytes 列表），而不是单独一行。
+    Linux 上通过 inotify 等待文件变化，其他平台每隔 interval 秒轮询
     """
-    while not handle.closed:
-        try:
-            line = readline(handle)
-        except NoNewData:
-            time.sleep(interval)
-        else:
-            logger.info("写入原始线程数据: %s", line.strip())
-            write_func(line)
+    fd = open_tail_fd(handle)
+    watch_fd = inotify_watch(handle.name)
+    pending = bytearray()
+    try:
+        while not handle.closed:
+            try:
+                chunk = read_chunk(fd)
+            except NoNewData:
+                if watch_fd is None:
+                    time.sleep(interval)
+                else:
+                    select.select([watch_fd], [], [])
+                    drain_events(watch_fd)
+            else:
+                if lines := split_lines(pending, chunk):
+                    logger.info("写入原始线程数据: %d 行", len(lines))
+                    write_func(lines)
+    finally:
+        os.close(fd)
+        if watch_fd is not None:
+            os.close(watch_fd)
 
 
 def run_threads(handles, interval, output_path):
@@ -64,9 +151,9 @@ def run_threads(handles, interval, output_path):
     with open(output_path, "wb") as output:
         lock = Lock()
 
-        def write(data):
+        def write(lines):
             with lock:
-                output.write(data)
+                output.write(b"".join(lines))
 
         threads = []
         for handle in handles:
@@ -87,14 +174,16 @@ def bad_tail_file(handle, interval, output):
     """
     错误示例：不安全地写入输出文件，可能导致行冲突
     """
+    pending = bytearray()
     while not handle.closed:
         try:
-            line = readline(handle)
+            chunk = read_chunk(handle.fileno())
         except NoNewData:
             time.sleep(interval)
         else:
-            logger.warning("【错误示例】正在写入数据，可能引发竞争: %s", line.strip())
-            output.write(line)
+            if lines := split_lines(pending, chunk):
+                logger.warning("【错误示例】正在写入数据，可能引发竞争: %d 行", len(lines))
+                output.write(b"".join(lines))
 
 
 def bad_run_threads(handles, interval, output_path):
@@ -117,19 +206,35 @@ def bad_run_threads(handles, interval, output_path):
 # 混合模式：协程 + 线程
 # --------------------------
 
-async def tail_async(handle, interval, write_func):
+async def tail_async(handle, interval, write_func, executor=None):
     """
-    协程版 tail_file：使用 asyncio.run_in_executor 调用 readline
+    协程版 tail_file：只把 os.read 交给 asyncio.run_in_executor，
+    按行切分在事件循环中完成。executor 为 None 时使用默认线程池。
+    Linux 上通过 inotify 等待文件变化，其他平台每隔 interval 秒轮询
     """
-    loop = asyncio.get_event_loop()
+    # 进入协程时绑定一次事件循环和 run_in_executor，循环内不再重复查找
+    loop = asyncio.get_running_loop()
+    run_in_executor = loop.run_in_executor
 
-    while not handle.closed:
-        try:
-            line = await loop.run_in_executor(None, readline, handle)
-        except NoNewData:
-            await asyncio.sleep(interval)
-        else:
-            await write_func(line)
+    fd = open_tail_fd(handle)
+    watch_fd = inotify_watch(handle.name)
+    pending = bytearray()
+    try:
+        while not handle.closed:
+            try:
+                chunk = await run_in_executor(executor, read_chunk, fd)
+            except NoNewData:
+                if watch_fd is None:
+                    await asyncio.sleep(interval)
+                else:
+                    await wait_for_change(loop, watch_fd)
+            else:
+                if lines := split_lines(pending, chunk):
+                    await write_func(lines)
+    finally:
+        os.close(fd)
+        if watch_fd is not None:
+            os.close(watch_fd)
 
 
 async def run_tasks_mixed(handles, interval, output_path):
@@ -137,52 +242,87 @@ async def run_tasks_mixed(handles, interval, output_path):
     混合模式：使用协程启动线程执行 tail_file，
     并通过 asyncio.run_coroutine_threadsafe 实现跨线程通信
     """
-    loop = asyncio.get_event_loop()
-
-    output = await loop.run_in_executor(None, open, output_path, "wb")
+    loop = asyncio.get_running_loop()
+    run_in_executor = loop.run_in_executor
+    # 每个 tail_file 会一直占用一个线程，再留一个线程给写入；
+    # 默认线程池最多 min(32, cpu+4) 个线程，句柄较多时会互相饿死
+    executor = ThreadPoolExecutor(
+        max_workers=len(handles) + 1, thread_name_prefix="tail"
+    )
+
+    output = await run_in_executor(executor, open, output_path, "wb")
     try:
 
-        async def write_async(data):
-            await loop.run_in_executor(None, output.write, data)
+        async def write_async(lines):
+            await run_in_executor(executor, output.write, b"".join(lines))
 
-        def write(data):
-            coro = write_async(data)
+        def write(lines):
+            coro = write_async(lines)
             future = asyncio.run_coroutine_threadsafe(coro, loop)
             future.result()
 
         tasks = []
         for handle in handles:
-            task = loop.run_in_executor(None, tail_file, handle, interval, write)
+            task = run_in_executor(executor, tail_file, handle, interval, write)
             tasks.append(task)
 
         await asyncio.gather(*tasks)
     finally:
-        await loop.run_in_executor(None, output.close)
+        await run_in_executor(executor, output.close)
+        executor.shutdown(wait=False)
 
 
 # --------------------------
 # 完全协程版本
 # --------------------------
 
+@contextmanager
+def eager_tasks():
+    """
+    在 with 块内把当前事件循环的任务工厂换成 asyncio.eager_task_factory，
+    新任务会立即同步执行到第一个 await，退出时恢复原来的工厂
+    """
+    loop = asyncio.get_running_loop()
+    if not isinstance(loop, asyncio.BaseEventLoop):
+        # uvloop 等第三方事件循环不接受 eager_task_factory，保持原有的任务工厂
+        yield
+        return
+    previous = loop.get_task_factory()
+    loop.set_task_factory(asyncio.eager_task_factory)
+    try:
+        yield
+    finally:
+        loop.set_task_factory(previous)
+
+
 async def run_tasks(handles, interval, output_path):
     """
     完全协程模式：完全异步处理输入文件并统一输出
     """
-    loop = asyncio.get_event_loop()
-
-    output = await loop.run_in_executor(None, open, output_path, "wb")
+    loop = asyncio.get_running_loop()
+    run_in_executor = loop.run_in_executor
+    # 线程池大小与句柄数量匹配：每个句柄一个读线程，再加一个写线程
+    executor = ThreadPoolExecutor(
+        max_workers=len(handles) + 1, thread_name_prefix="tail"
+    )
+
+    output = await run_in_executor(executor, open, output_path, "wb")
     try:
 
-        async def write_async(data):
-            logger.info("写入协程数据: %s", data.strip())
-            await loop.run_in_executor(None, output.write, data)
+        async def write_async(lines):
+            logger.info("写入协程数据: %d 行", len(lines))
+            await run_in_executor(executor, output.write, b"".join(lines))
 
-        async with asyncio.TaskGroup() as group:
-            for handle in handles:
-                group.create_task(tail_async(handle, interval, write_async))
+        with eager_tasks():
+            async with asyncio.TaskGroup() as group:
+                for handle in handles:
+                    group.create_task(
+                        tail_async(handle, interval, write_async, executor)
+                    )
 
     finally:
-        await loop.run_in_executor(None, output.close)
+        await run_in_executor(executor, output.close)
+        executor.shutdown(wait=False)
 
 
 # --------------------------
@@ -196,9 +336,9 @@ def wrapped_tail_file(handle, interval, write_func):
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
 
-    async def write_async(data):
-        logger.info("自底向上写入数据: %s", data.strip())
-        await loop.run_in_executor(None, write_func, data)
+    async def write_async(lines):
+        logger.info("自底向上写入数据: %d 行", len(lines))
+        await loop.run_in_executor(None, write_func, lines)
 
     coro = tail_async(handle, interval, write_async)
     loop.run_until_complete(coro)
@@ -211,9 +351,9 @@ def wrapped_run_threads(handles, interval, output_path):
     with open(output_path, "wb") as output:
         lock = Lock()
 
-        def write(data):
+        def write(lines):
             with lock:
-                output.write(data)
+                output.write(b"".join(lines))
 
         threads = []
         for handle in handles:
@@ -293,5 +433,11 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # 安装了 uvloop 时使用基于 libuv 的事件循环，降低每次回调和 run_in_executor 的调度开销
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        asyncio.run(main(), loop_factory=uvloop.new_event_loop)
 
@@ -5,19 +5,30 @@
 - 使用 `run_in_executor` 将阻塞操作移出主线程
 - 构建 `WriteThread` 类来封装异步写入逻辑
 - 使用 `__aenter__` 和 `__aexit__` 支持异步上下文管理
+- 使用单消费者 `asyncio.Queue` 合并写入，省去第二个事件循环和跨线程唤醒
+- 安装 caio 时用内核异步 I/O 读取，不再为每个句柄占用一个线程
 - 完整示例包含错误用法和正确用法，并附有详细说明
 
 依赖库：asyncio, threading, logging, os, tempfile, collections
 """
 
 import asyncio
+import ctypes
 import logging
 import os
+import sys
 import tempfile
 import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from threading import Thread
 
+try:
+    import caio  # 可选依赖：Linux 上基于 libaio/io_uring 的内核异步文件 I/O
+except ImportError:
+    caio = None
+
 # 设置日志系统
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
@@ -41,7 +52,7 @@ async def good_coroutine():
     正确示例：使用 loop.run_in_executor 将阻塞操作放入线程池中执行，
     避免阻塞主事件循环。
     """
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
     logger.info("开始执行非阻塞协程")
     await loop.run_in_executor(None, time.sleep, 1)
     logger.info("非阻塞协程完成")
@@ -52,36 +63,182 @@ class NoNewData(Exception):
     pass
 
 
-def readline(handle):
-    offset = handle.tell()
-    handle.seek(0, 2)
-    length = handle.tell()
-
-    if length == offset:
+def read_chunk(fd, size=65536):
+    # 直接对描述符做一次 os.read 取回所有新数据，不经过缓冲 I/O 层，
+    # 代替逐行的 tell/seek/readline
+    data = os.read(fd, size)
+    if not data:
         raise NoNewData
+    return data
+
+
+# 为 handle 的文件单独打开一个只读描述符并定位到 handle 当前的偏移量；
+# 独立的文件描述不影响 handle 关闭时的 IN_CLOSE_NOWRITE，也不会读到被复用的描述符
+def open_tail_fd(handle):
+    fd = os.open(handle.name, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+    os.lseek(fd, os.lseek(handle.fileno(), 0, os.SEEK_CUR), os.SEEK_SET)
+    return fd
+
+
+def split_lines(pending, chunk):
+    # 以列表形式返回所有完整的行，不完整的尾部留在 pending 中
+    pending.extend(chunk)
+    end = pending.rfind(b"\n") + 1
+    lines = bytes(pending[:end]).splitlines(keepends=True)
+    del pending[:end]
+    return lines
+
+
+# inotify：文件被写入，或者文件的只读句柄被关闭
+IN_MODIFY = 0x00000002
+IN_CLOSE_NOWRITE = 0x00000010
+
+# Linux 上导入时解析一次 libc，不在每次创建监听时调用 find_library
+_LIBC = ctypes.CDLL(None, use_errno=True) if sys.platform.startswith("linux") else None
+
+
+# Linux 上返回监听 path 的非阻塞 inotify 描述符，其他平台返回 None 以退回轮询
+def inotify_watch(path):
+    if _LIBC is None:
+        return None
+    watch_fd = _LIBC.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    if watch_fd < 0:
+        return None
+    if _LIBC.inotify_add_watch(watch_fd, os.fsencode(path), IN_MODIFY | IN_CLOSE_NOWRITE) < 0:
+        os.close(watch_fd)
+        return None
+    return watch_fd
+
+
+# 等待 inotify 描述符可读，然后读空事件队列
+async def wait_for_change(loop, watch_fd):
+    future = loop.create_future()
+    loop.add_reader(watch_fd, lambda: future.done() or future.set_result(None))
+    try:
+        await future
+    finally:
+        loop.remove_reader(watch_fd)
+    try:
+        while os.read(watch_fd, 4096):
+            pass
+    except BlockingIOError:
+        pass
+
+
+# 异步迭代器形式的尾随读取器：每次产出一批完整的行。
+# 有 inotify 时只在文件变化时醒来，否则每隔 interval 秒轮询
+async def tail_iter(handle, interval, executor=None):
+    # 进入协程时绑定一次事件循环和 run_in_executor，循环内不再重复查找
+    loop = asyncio.get_running_loop()
+    run_in_executor = loop.run_in_executor
+
+    fd = open_tail_fd(handle)
+    watch_fd = inotify_watch(handle.name)
+    pending = bytearray()
+    try:
+        while not handle.closed:
+            try:
+                chunk = await run_in_executor(executor, read_chunk, fd)
+            except NoNewData:
+                if watch_fd is None:
+                    await asyncio.sleep(interval)
+                else:
+                    await wait_for_change(loop, watch_fd)
+            else:
+                if lines := split_lines(pending, chunk):
+                    yield lines
+    finally:
+        os.close(fd)
+        if watch_fd is not None:
+            os.close(watch_fd)
 
-    handle.seek(offset, 0)
-    return handle.readline()
 
+# 回调形式的尾随读取器：把 tail_iter 产出的每批行交给 write_func
+async def tail_async(handle, interval, write_func, executor=None):
+    async for lines in tail_iter(handle, interval, executor):
+        await write_func(lines)
 
-# 异步尾随读取器
-async def tail_async(handle, interval, write_func):
-    loop = asyncio.get_event_loop()
 
-    while not handle.closed:
+# 合并多个异步迭代器：谁先产出就先交出谁的结果，不会被最慢的来源拖住
+async def merge(*aiters):
+    queue = asyncio.Queue()
+    finished = object()
+
+    async def pump(aiter):
         try:
-            line = await loop.run_in_executor(None, readline, handle)
-        except NoNewData:
-            await asyncio.sleep(interval)
-        else:
-            await write_func(line)
+            async for item in aiter:
+                await queue.put(item)
+        finally:
+            queue.put_nowait(finished)
+
+    tasks = [asyncio.create_task(pump(aiter)) for aiter in aiters]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            item = await queue.get()
+            if item is finished:
+                remaining -= 1
+            else:
+                yield item
+        for task in tasks:
+            task.result()  # 重新抛出来源中的异常
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# 在 with 块内启用 eager 任务工厂：新任务立即执行到第一个 await，
+# 省去一次 call_soon 调度，退出时恢复原来的工厂
+@contextmanager
+def eager_tasks():
+    loop = asyncio.get_running_loop()
+    if not isinstance(loop, asyncio.BaseEventLoop):
+        # uvloop 等第三方事件循环不接受 eager_task_factory，保持原有的任务工厂
+        yield
+        return
+    previous = loop.get_task_factory()
+    loop.set_task_factory(asyncio.eager_task_factory)
+    try:
+        yield
+    finally:
+        loop.set_task_factory(previous)
+
+
+# writev 单次调用最多接受的缓冲区个数。上限不确定时 sysconf 返回 -1，
+# 因此至少取 POSIX 保证的 16；无法查询时使用常见的 1024
+try:
+    IOV_MAX = max(os.sysconf("SC_IOV_MAX"), 16)
+except (AttributeError, ValueError, OSError):
+    IOV_MAX = 1024
+
+
+# 把一批行写入文件：支持 os.writev 时由内核分散/聚集写入，省去 b"".join 的拷贝；
+# 遇到部分写入时从未写完的位置继续。不支持 writev 的平台退回 join + write
+def write_lines(output, lines):
+    if not hasattr(os, "writev"):
+        output.write(b"".join(lines))
+        return
+    output.flush()  # 确保缓冲区中没有先于本批的数据
+    fd = output.fileno()
+    buffers = [memoryview(line) for line in lines if line]
+    start = 0
+    while start < len(buffers):
+        written = os.writev(fd, buffers[start:start + IOV_MAX])
+        if not written:
+            raise OSError("writev 没有写入任何数据")
+        while start < len(buffers) and written >= len(buffers[start]):
+            written -= len(buffers[start])
+            start += 1
+        if written:
+            buffers[start] = buffers[start][written:]
 
 
 # 简化的错误版本：直接使用同步文件写入
 async def run_tasks_simpler(handles, interval, output_path):
     with open(output_path, "wb") as output:
-        async def write_async(data):
-            output.write(data)
+        async def write_async(lines):
+            output.write(b"".join(lines))
 
         async with asyncio.TaskGroup() as group:
             for handle in handles:
@@ -90,17 +247,27 @@ async def run_tasks_simpler(handles, interval, output_path):
 
 # 正确版本：使用 run_in_executor 的完整实现
 async def run_tasks(handles, interval, output_path):
-    loop = asyncio.get_event_loop()
-    output = await loop.run_in_executor(None, open, output_path, "wb")
+    loop = asyncio.get_running_loop()
+    run_in_executor = loop.run_in_executor
+    # 专用线程池：每个句柄一个读线程，再加一个写线程
+    executor = ThreadPoolExecutor(
+        max_workers=len(handles) + 1, thread_name_prefix="tail"
+    )
+    output = await run_in_executor(executor, open, output_path, "wb")
     try:
-        async def write_async(data):
-            await loop.run_in_executor(None, output.write, data)
-
-        async with asyncio.TaskGroup() as group:
-            for handle in handles:
-                group.create_task(tail_async(handle, interval, write_async))
+        # 每批行只需一次线程池往返
+        async def write_async(lines):
+            await run_in_executor(executor, write_lines, output, lines)
+
+        with eager_tasks():
+            async with asyncio.TaskGroup() as group:
+                for handle in handles:
+                    group.create_task(
+                        tail_async(handle, interval, write_async, executor)
+                    )
     finally:
-        await loop.run_in_executor(None, output.close)
+        await run_in_executor(executor, output.close)
+        executor.shutdown(wait=False)
 
 
 # 写入线程类：封装异步写入逻辑
@@ -117,11 +284,11 @@ class WriteThread(Thread):
             self.loop.run_forever()
         self.loop.run_until_complete(asyncio.sleep(0))
 
-    async def real_write(self, data):
-        self.output.write(data)
+    async def real_write(self, lines):
+        write_lines(self.output, lines)
 
-    async def write(self, data):
-        coro = self.real_write(data)
+    async def write(self, lines):
+        coro = self.real_write(lines)
         future = asyncio.run_coroutine_threadsafe(coro, self.loop)
         await asyncio.wrap_future(future)
 
@@ -134,7 +301,7 @@ class WriteThread(Thread):
         await asyncio.wrap_future(future)
 
     async def __aenter__(self):
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         await loop.run_in_executor(None, self.start)
         return self
 
@@ -142,14 +309,116 @@ class WriteThread(Thread):
         await self.stop()
 
 
-# 使用 WriteThread 的最终版本
+# 使用 WriteThread 的版本：每次写入都要通过 run_coroutine_threadsafe 跨线程唤醒
+async def run_with_write_thread(handles, interval, output_path):
+    with eager_tasks():
+        async with (
+            WriteThread(output_path) as output,
+            asyncio.TaskGroup() as group,
+        ):
+            for handle in handles:
+                group.create_task(tail_async(handle, interval, output.write))
+
+
+# 单消费者写入协程：取出队列中已积压的所有批次，合并成一次线程池写入
+# （writev 直接写出行列表，不再拼接）；收到 None 时退出
+async def drain_queue(queue, output):
+    loop = asyncio.get_running_loop()
+    done = False
+    while not done:
+        batches = [await queue.get()]
+        while not queue.empty():
+            batches.append(queue.get_nowait())
+        if batches[-1] is None:
+            batches.pop()
+            done = True
+        lines = [line for batch in batches for line in batch]
+        if lines:
+            await loop.run_in_executor(None, write_lines, output, lines)
+
+
+# 最终版本：生产者把行批次放入 asyncio.Queue，由一个写入协程按顺序合并写出
 async def run_fully_async(handles, interval, output_path):
-    async with (
-        WriteThread(output_path) as output,
-        asyncio.TaskGroup() as group,
-    ):
-        for handle in handles:
-            group.create_task(tail_async(handle, interval, output.write))
+    loop = asyncio.get_running_loop()
+    output = await loop.run_in_executor(None, open, output_path, "wb")
+    try:
+        queue = asyncio.Queue()
+        drainer = asyncio.create_task(drain_queue(queue, output))
+        try:
+            with eager_tasks():
+                async with asyncio.TaskGroup() as group:
+                    for handle in handles:
+                        group.create_task(tail_async(handle, interval, queue.put))
+        finally:
+            await queue.put(None)
+            await drainer
+    finally:
+        await loop.run_in_executor(None, output.close)
+
+
+# 基于 caio 的尾随读取器：按偏移量向内核队列提交读请求，不占用线程池线程
+async def tail_caio(handle, interval, write_func, context):
+    fd = open_tail_fd(handle)
+    offset = os.lseek(fd, 0, os.SEEK_CUR)
+    loop = asyncio.get_running_loop()
+    watch_fd = inotify_watch(handle.name)
+    pending = bytearray()
+    try:
+        while not handle.closed:
+            chunk = await context.read(65536, fd, offset)
+            if not chunk:
+                if watch_fd is None:
+                    await asyncio.sleep(interval)
+                else:
+                    await wait_for_change(loop, watch_fd)
+                continue
+            offset += len(chunk)
+            if lines := split_lines(pending, chunk):
+                await write_func(lines)
+    finally:
+        os.close(fd)
+        if watch_fd is not None:
+            os.close(watch_fd)
+
+
+# 使用 caio 读取所有文件：N 个句柄的读请求同时排在内核队列中；
+# 未安装 caio 时退回 run_fully_async
+async def run_tasks_caio(handles, interval, output_path):
+    if caio is None:
+        logger.info("未安装 caio，退回 run_in_executor 读取")
+        await run_fully_async(handles, interval, output_path)
+        return
+
+    loop = asyncio.get_running_loop()
+    context = caio.AsyncioContext(max_requests=len(handles))
+    output = await loop.run_in_executor(None, open, output_path, "wb")
+    try:
+        queue = asyncio.Queue()
+        drainer = asyncio.create_task(drain_queue(queue, output))
+        try:
+            async with asyncio.TaskGroup() as group:
+                for handle in handles:
+                    group.create_task(
+                        tail_caio(handle, interval, queue.put, context)
+                    )
+        finally:
+            await queue.put(None)
+            await drainer
+    finally:
+        await loop.run_in_executor(None, output.close)
+        context.close()
+
+
+# 以异步迭代器合并所有文件的行，到达即写出
+async def run_tasks_merged(handles, interval, output_path):
+    loop = asyncio.get_running_loop()
+    output = await loop.run_in_executor(None, open, output_path, "wb")
+    try:
+        tails = [tail_iter(handle, interval) for handle in handles]
+        async for lines in merge(*tails):
+            await loop.run_in_executor(None, write_lines, output, lines)
+    finally:
+        await loop.run_in_executor(None, output.close)
 
 
 # 验证合并结果是否正确
@@ -215,10 +484,28 @@ async def main():
 
     # 示例 5：使用 WriteThread 实现完全异步写入
     logger.info("=== 示例 5：使用 WriteThread ===")
-    await run_fully_async(handles, 0.1, output_path)
+    await run_with_write_thread(handles, 0.1, output_path)
     confirm_merge(input_paths, output_path)
     logger.info("WriteThread 输出验证成功")
 
+    # 示例 6：使用 asyncio.Queue 单消费者写入
+    logger.info("=== 示例 6：使用 asyncio.Queue 写入 ===")
+    await run_fully_async(handles, 0.1, output_path)
+    confirm_merge(input_paths, output_path)
+    logger.info("asyncio.Queue 输出验证成功")
+
+    # 示例 7：使用 caio 提交内核异步读请求
+    logger.info("=== 示例 7：使用 caio 读取 ===")
+    await run_tasks_caio(handles, 0.1, output_path)
+    confirm_merge(input_paths, output_path)
+    logger.info("caio 输出验证成功")
+
+    # 示例 8：以异步迭代器合并各文件的行
+    logger.info("=== 示例 8：合并异步迭代器 ===")
+    await run_tasks_merged(handles, 0.1, output_path)
+    confirm_merge(input_paths, output_path)
+    logger.info("异步迭代器合并输出验证成功")
+
     # 清理资源
     for h in handles:
         h.close()
@@ -226,4 +513,10 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # 安装了 uvloop 时使用基于 libuv 的事件循环，降低每次回调和 run_in_executor 的调度开销
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        asyncio.run(main(), loop_factory=uvloop.new_event_loop)
@@ -7,21 +7,43 @@
 2. 线程池执行：使用 ThreadPoolExecutor，但受限于 GIL，无法实现 CPU 并行。
 3. 进程池执行：使用 ProcessPoolExecutor，可以真正利用多核 CPU 并行处理任务。
 4. 错误示例：错误地尝试在多进程中使用全局状态或共享数据。
+5. NumPy 向量化：把逐个取模的 Python 循环分块交给 NumPy 在 C 层完成。
+6. Numba 并行内核：保留试除法，但编译成机器码并在多核上批量计算，无需进程间序列化。
 """
 
+import argparse
 import logging
+import math
+import multiprocessing
+import os
 import time
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
-# 配置日志记录
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+import numpy as np
+from numba import njit, prange
+
 logger = logging.getLogger(__name__)
 
 
 def gcd(pair):
     """
-    计算两个数的最大公约数 (GCD)。
-    这是一个计算密集型函数，适合用于演示并行化效果。
+    使用 math.gcd 计算两个数的最大公约数 (GCD)。
+    C 实现的 Lehmer 算法，复杂度为 O(log n)，远快于逐个试除。
+
+    参数:
+        pair (tuple): 包含两个整数的元组
+
+    返回:
+        int: 最大公约数
+    """
+    a, b = pair
+    return math.gcd(a, b)
+
+
+def slow_gcd(pair):
+    """
+    通过逐个试除计算两个数的最大公约数 (GCD)。
+    这是一个计算密集型函数，适合用于演示并行化效果（使用 --slow 运行）。
 
     参数:
         pair (tuple): 包含两个整数的元组
@@ -37,34 +59,100 @@ def gcd(pair):
     raise RuntimeError("Not reachable")
 
 
+def numpy_gcd(pair, block_size=1_000_000):
+    """
+    使用 NumPy 向量化的试除法计算最大公约数。
+    从 min(a, b) 开始向下每次取一块候选除数，整块做取模运算，
+    找到的第一个公共因子就是最大公约数。
+
+    参数:
+        pair (tuple): 包含两个整数的元组
+        block_size (int): 每块候选除数的数量
+
+    返回:
+        int: 最大公约数
+    """
+    a, b = pair
+    high = min(a, b)
+    while high > 0:
+        low = max(high - block_size, 0)
+        candidates = np.arange(high, low, -1, dtype=np.int64)
+        mask = (a % candidates == 0) & (b % candidates == 0)
+        if mask.any():
+            return int(candidates[np.argmax(mask)])
+        high = low
+    raise RuntimeError("Not reachable")
+
+
+@njit(parallel=True, cache=True)
+def gcd_batch(a_arr, b_arr, out):
+    """
+    Numba 编译的批量试除法内核，prange 把不同的数对分给多个线程，
+    执行期间释放 GIL。
+
+    参数:
+        a_arr (np.ndarray): 每个数对的第一个整数
+        b_arr (np.ndarray): 每个数对的第二个整数
+        out (np.ndarray): 写入每个数对最大公约数的数组
+    """
+    for k in prange(len(a_arr)):
+        a = a_arr[k]
+        b = b_arr[k]
+        i = min(a, b)
+        while i > 0:
+            if a % i == 0 and b % i == 0:
+                out[k] = i
+                break
+            i -= 1
+
+
+def numba_gcd(numbers):
+    """
+    把数对列表转换成数组后交给 gcd_batch 一次性计算。
+
+    参数:
+        numbers (list): 包含多个元组的列表，每个元组有两个整数
+
+    返回:
+        list: 每个元组对应的最大公约数
+    """
+    a_arr = np.array([a for a, _ in numbers], dtype=np.int64)
+    b_arr = np.array([b for _, b in numbers], dtype=np.int64)
+    out = np.zeros(len(numbers), dtype=np.int64)
+    gcd_batch(a_arr, b_arr, out)
+    return out.tolist()
+
+
 # -----------------------------
 # 示例 1: 串行执行
 # -----------------------------
 
-def serial_gcd(numbers):
+def serial_gcd(numbers, func=gcd):
     """
     串行计算最大公约数。
     适用于理解没有并行化的基准性能。
 
     参数:
         numbers (list): 包含多个元组的列表，每个元组有两个整数
+        func (callable): 计算单个元组最大公约数的函数
 
     返回:
         list: 每个元组对应的最大公约数
     """
-    return list(map(gcd, numbers))
+    return list(map(func, numbers))
 
 
-def run_serial(numbers):
+def run_serial(numbers, func=gcd):
     """
     执行串行版本的 GCD 计算，并记录耗时。
 
     参数:
         numbers (list): 包含多个元组的列表，每个元组有两个整数
+        func (callable): 计算单个元组最大公约数的函数
     """
     logger.info("开始串行执行...")
     start_time = time.perf_counter()
-    results = serial_gcd(numbers)
+    results = serial_gcd(numbers, func)
     end_time = time.perf_counter()
     delta = end_time - start_time
     logger.info(f"串行执行完成，结果数量: {len(results)}，耗时: {delta:.3f} 秒")
@@ -75,31 +163,33 @@ def run_serial(numbers):
 # 示例 2: 使用 ThreadPoolExecutor（受 GIL 限制）
 # -----------------------------
 
-def threaded_gcd(numbers):
+def threaded_gcd(numbers, func=gcd):
     """
     使用线程池执行最大公约数计算。
     虽然看起来是并行，但由于 GIL 的存在，CPU 密集型任务不会加快。
 
     参数:
         numbers (list): 包含多个元组的列表，每个元组有两个整数
+        func (callable): 计算单个元组最大公约数的函数
 
     返回:
         list: 每个元组对应的最大公约数
     """
     with ThreadPoolExecutor(max_workers=8) as executor:
-        return list(executor.map(gcd, numbers))
+        return list(executor.map(func, numbers))
 
 
-def run_threaded(numbers):
+def run_threaded(numbers, func=gcd):
     """
     执行线程池版本的 GCD 计算，并记录耗时。
 
     参数:
         numbers (list): 包含多个元组的列表，每个元组有两个整数
+        func (callable): 计算单个元组最大公约数的函数
     """
     logger.info("开始线程池执行...")
     start_time = time.perf_counter()
-    results = threaded_gcd(numbers)
+    results = threaded_gcd(numbers, func)
     end_time = time.perf_counter()
     delta = end_time - start_time
     logger.info(f"线程池执行完成，结果数量: {len(results)}，耗时: {delta:.3f} 秒")
@@ -110,37 +200,96 @@ def run_threaded(numbers):
 # 示例 3: 使用 ProcessPoolExecutor（真正的并行）
 # -----------------------------
 
-def parallel_gcd(numbers):
+def pool_context():
+    """
+    返回进程池使用的多进程上下文。
+
+    平台支持 forkserver 时使用它：工作进程从一个已导入本模块的精简模板进程
+    fork 出来，不必像 spawn 那样每个进程重新导入 numpy/numba；否则使用平台默认方式。
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context()
+
+
+def parallel_gcd(numbers, func=gcd):
     """
     使用进程池执行最大公约数计算。
     可以真正利用多核 CPU 加速 CPU 密集型任务。
 
     参数:
         numbers (list): 包含多个元组的列表，每个元组有两个整数
+        func (callable): 计算单个元组最大公约数的函数
 
     返回:
         list: 每个元组对应的最大公约数
     """
-    with ProcessPoolExecutor(max_workers=8) as executor:
-        return list(executor.map(gcd, numbers))
+    workers = os.cpu_count() or 1
+    # 默认 chunksize=1 会为每个元组单独序列化并发送一次，这里按批发送
+    chunksize = max(1, len(numbers) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context()) as executor:
+        return list(executor.map(func, numbers, chunksize=chunksize))
 
 
-def run_parallel(numbers):
+def run_parallel(numbers, func=gcd):
     """
     执行进程池版本的 GCD 计算，并记录耗时。
 
     参数:
         numbers (list): 包含多个元组的列表，每个元组有两个整数
+        func (callable): 计算单个元组最大公约数的函数
     """
     logger.info("开始进程池执行...")
     start_time = time.perf_counter()
-    results = parallel_gcd(numbers)
+    results = parallel_gcd(numbers, func)
     end_time = time.perf_counter()
     delta = end_time - start_time
     logger.info(f"进程池执行完成，结果数量: {len(results)}，耗时: {delta:.3f} 秒")
     return results
 
 
+# -----------------------------
+# 示例 4: 使用 NumPy 向量化
+# -----------------------------
+
+def run_numpy(numbers):
+    """
+    执行 NumPy 向量化版本的 GCD 计算，并记录耗时。
+
+    参数:
+        numbers (list): 包含多个元组的列表，每个元组有两个整数
+    """
+    logger.info("开始 NumPy 向量化执行...")
+    start_time = time.perf_counter()
+    results = list(map(numpy_gcd, numbers))
+    end_time = time.perf_counter()
+    delta = end_time - start_time
+    logger.info(f"NumPy 向量化执行完成，结果数量: {len(results)}，耗时: {delta:.3f} 秒")
+    return results
+
+
+# -----------------------------
+# 示例 5: 使用 Numba 并行内核
+# -----------------------------
+
+def run_numba(numbers):
+    """
+    执行 Numba 并行内核版本的 GCD 计算，并记录耗时。
+    首次调用会触发 JIT 编译（cache=True 时之后从磁盘缓存加载），因此先预热。
+
+    参数:
+        numbers (list): 包含多个元组的列表，每个元组有两个整数
+    """
+    numba_gcd(numbers[:1])  # 预热
+    logger.info("开始 Numba 并行执行...")
+    start_time = time.perf_counter()
+    results = numba_gcd(numbers)
+    end_time = time.perf_counter()
+    delta = end_time - start_time
+    logger.info(f"Numba 并行执行完成，结果数量: {len(results)}，耗时: {delta:.3f} 秒")
+    return results
+
+
 # -----------------------------
 # 错误示例：尝试在多进程中共享可变状态
 # -----------------------------
@@ -164,7 +313,7 @@ def bad_parallel_execution():
     logger.warning("开始错误示例：尝试在多进程中共享状态...")
     numbers = [1, 2, 3, 4, 5]
     try:
-        with ProcessPoolExecutor() as executor:
+        with ProcessPoolExecutor(mp_context=pool_context()) as executor:
             results = list(executor.map(bad_parallel_task, numbers))
         logger.warning(f"错误示例结果: {results}")
         logger.warning("注意：每个进程都有自己的 SHARED_COUNTER 副本，全局状态未被共享！")
@@ -180,6 +329,15 @@ def main():
     """
     主函数，运行所有示例。
     """
+    parser = argparse.ArgumentParser(description="Run concurrent.futures examples")
+    parser.add_argument(
+        "--slow",
+        action="store_true",
+        help="使用逐个试除的 slow_gcd，演示 CPU 密集型任务的并行效果",
+    )
+    args = parser.parse_args()
+    func = slow_gcd if args.slow else gcd
+
     # 测试数据集
     NUMBERS = [
         (19633090, 22659730),
@@ -195,17 +353,25 @@ def main():
     ]
 
     # 1. 串行执行
-    run_serial(NUMBERS)
+    run_serial(NUMBERS, func)
 
     # 2. 线程池执行（受 GIL 影响）
-    run_threaded(NUMBERS)
+    run_threaded(NUMBERS, func)
 
     # 3. 进程池执行（真正的并行）
-    run_parallel(NUMBERS)
+    run_parallel(NUMBERS, func)
+
+    # 4. NumPy 向量化执行
+    run_numpy(NUMBERS)
+
+    # 5. Numba 并行内核
+    run_numba(NUMBERS)
 
-    # 4. 错误示例：尝试共享状态
+    # 6. 错误示例：尝试共享状态
     bad_parallel_execution()
 
 
 if __name__ == "__main__":
+    # 只在主进程中配置日志，工作进程导入本模块时跳过
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     main()
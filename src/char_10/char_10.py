@@ -23,35 +23,68 @@ Item 90: 不设置 __debug__ = False
 Item 91: 避免使用 eval/exec
 """
 
+import json
 import logging
 import os
-import random
 import string
 import tempfile
 import traceback
 from datetime import datetime
-from typing import Generator, List, Dict, Any
+from typing import Generator, Iterable, Dict, Any
 from contextlib import contextmanager
 
+import numpy as np
+
 # 设置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # Item 90: Never Set __debug__ to False
 assert __debug__, "调试模式被禁用，这可能导致断言失效"
 
+STATUSES = np.array(['stable', 'critical', 'recovering'])
+PATIENT_COLUMNS = ('patient_id', 'timestamp', 'status', 'bp_high', 'bp_low', 'heart_rate')
+
 # 数据构造区
+def generate_patient_columns(count: int = 100000) -> Dict[str, np.ndarray]:
+    """
+    以列式（每个字段一个 NumPy 数组）生成模拟患者体检数据
+
+    status 存储为 STATUSES 中的下标，血压和心率使用 uint8，
+    整批数据共享同一个生成时间戳
+    """
+    rng = np.random.default_rng()
+    alphabet = np.frombuffer((string.ascii_uppercase + string.digits).encode(), dtype='S1')
+    return {
+        'patient_id': alphabet[rng.integers(0, len(alphabet), (count, 8))].view('S8').ravel(),
+        'timestamp': np.full(count, np.datetime64(datetime.now(), 'us')),
+        'status': rng.integers(0, len(STATUSES), count, dtype=np.uint8),
+        'bp_high': rng.integers(90, 181, count, dtype=np.uint8),
+        'bp_low': rng.integers(60, 121, count, dtype=np.uint8),
+        'heart_rate': rng.integers(50, 121, count, dtype=np.uint8),
+    }
+
 def generate_patient_records(count: int = 100000) -> Generator[Dict[str, Any], None, None]:
     """
     生成模拟患者体检数据（ID、时间戳、状态、血压、心率等）
+
+    各字段的随机数由 generate_patient_columns 一次性批量生成，再逐条组装成字典；
+    整批记录共享同一个时间戳，只格式化一次
     """
-    statuses = ['stable', 'critical', 'recovering']
-    for i in range(count):
+    columns = generate_patient_columns(count)
+    timestamp = columns['timestamp'][0].item().isoformat() if count else None
+    for patient_id, status, high, low, heart_rate in zip(
+        columns['patient_id'].astype('U8').tolist(),
+        STATUSES[columns['status']].tolist(),
+        columns['bp_high'].tolist(),
+        columns['bp_low'].tolist(),
+        columns['heart_rate'].tolist(),
+    ):
         yield {
-            'patient_id': ''.join(random.choices(string.ascii_uppercase + string.digits, k=8)),
-            'timestamp': datetime.now().isoformat(),
-            'status': random.choice(statuses),
-            'blood_pressure': f"{random.randint(90, 180)}/{random.randint(60, 120)}",
-            'heart_rate': random.randint(50, 120)
+            'patient_id': patient_id,
+            'timestamp': timestamp,
+            'status': status,
+            'blood_pressure': f"{high}/{low}",
+            'heart_rate': heart_rate
         }
 
 # 上下文管理器：用于创建临时备份文件
@@ -72,51 +105,88 @@ def TemporaryFileBackup(prefix: str = 'backup_', suffix: str = '.txt') -> str:
 # 数据写入与读取
 def write_patient_to_file(records: Generator[Dict[str, Any], None, None], filename: str):
     """
-    将患者数据写入文件
+    将患者数据以 JSON Lines 格式写入文件（每行一个 JSON 对象）
     """
     try:
         with open(filename, 'w') as f:
             for record in records:
-                f.write(f"{record}\n")
+                f.write(json.dumps(record))
+                f.write("\n")
     except IOError as e:
         logging.error(f"写入文件失败: {e}")
         raise
 
-def read_patient_file(filename: str) -> List[Dict[str, Any]]:
+def read_patient_file(filename: str) -> Generator[Dict[str, Any], None, None]:
     """
-    读取患者数据文件
+    逐行读取并解析患者数据文件，不会把所有行一次性读入内存
     """
     # Item 83: Always Make try Blocks as Short as Possible
     try:
-        with open(filename, 'r') as f:
-            lines = f.readlines()
+        f = open(filename, 'r')
     except FileNotFoundError as e:
         logging.error(f"文件未找到: {e}")
         raise
 
-    records = []
-    for line in lines:
-        try:
-            # Item 88: Consider Explicitly Chaining Exceptions
-            # 使用 eval 是一个潜在风险点（Item 91），这里仅用于示例
-            # 在真实项目中应避免使用 eval
-            record = eval(line.strip())
-            records.append(record)
-        except SyntaxError as e:
-            logging.error(f"解析行失败: {line}")
-            raise ValueError("无法解析记录") from e
-    return records
+    with f:
+        for line in f:
+            try:
+                # Item 88: Consider Explicitly Chaining Exceptions
+                # Item 91: 使用 json.loads 解析数据，避免 eval 逐行编译执行带来的开销和安全风险
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                logging.error(f"解析行失败: {line}")
+                raise ValueError("无法解析记录") from e
+            yield record
+
+def write_patient_columns(columns: Dict[str, np.ndarray], filename: str):
+    """
+    将列式患者数据一次性写入 .npz 文件
+    """
+    try:
+        with open(filename, 'wb') as f:
+            np.savez(f, **columns)
+    except IOError as e:
+        logging.error(f"写入文件失败: {e}")
+        raise
+
+def read_patient_columns(filename: str) -> Dict[str, np.ndarray]:
+    """
+    读取列式患者数据文件，每一列都是一次 C 层面的整块读取
+    """
+    # Item 83: Always Make try Blocks as Short as Possible
+    try:
+        data = np.load(filename)
+    except FileNotFoundError as e:
+        logging.error(f"文件未找到: {e}")
+        raise
+
+    with data:
+        return {name: data[name] for name in data.files}
 
 # 数据校验
-def validate_patient_data(records: List[Dict[str, Any]]):
+def validate_patient_columns(columns: Dict[str, np.ndarray]):
     """
-    校验患者数据是否完整有效
+    校验列式患者数据是否完整有效，只检查列名和列长度，与记录数无关
     """
     # Item 81: assert Internal Assumptions
-    assert isinstance(records, list), "记录必须是列表类型"
-    assert all('patient_id' in r for r in records), "每条记录必须包含 patient_id"
+    assert set(PATIENT_COLUMNS) <= columns.keys(), "缺少必要的数据列"
+    count = len(columns['patient_id'])
+    assert all(len(columns[name]) == count for name in PATIENT_COLUMNS), "各列长度必须一致"
+
+    if not count:
+        raise ValueError("无有效记录")
 
-    if not records:
+def validate_patient_data(records: Iterable[Dict[str, Any]]):
+    """
+    边读取边校验患者数据是否完整有效
+    """
+    count = 0
+    for record in records:
+        # Item 81: assert Internal Assumptions
+        assert 'patient_id' in record, "每条记录必须包含 patient_id"
+        count += 1
+
+    if not count:
         raise ValueError("无有效记录")
 
 # 主流程控制
@@ -158,6 +228,28 @@ def process_patient_data():
     finally:
         logging.info("数据处理流程结束")
 
+def process_patient_columns():
+    """
+    以列式存储处理患者数据：生成、写入、读取、校验都直接操作 NumPy 数组
+    """
+    try:
+        logging.info("开始生成列式模拟患者数据...")
+        columns = generate_patient_columns(100000)
+
+        with TemporaryFileBackup(suffix='.npz') as temp_filename:
+            logging.info("写入列式临时备份文件...")
+            write_patient_columns(columns, temp_filename)
+
+            logging.info("读取并处理列式数据...")
+            columns = read_patient_columns(temp_filename)
+
+            validate_patient_columns(columns)
+    except ValueError as ve:
+        logging.error(f"值错误异常: {ve}")
+        logging.debug(traceback.format_exc())
+    else:
+        logging.info("列式数据处理完成，无异常发生")
+
 # 异常变量测试
 def log_error_details():
     """
@@ -179,7 +271,7 @@ def generate_patient_records_from_file(file_path: str) -> Generator[Dict[str, An
     """
     with open(file_path, 'r') as f:
         for line in f:
-            yield eval(line.strip())
+            yield json.loads(line)
 
 if __name__ == '__main__':
     # 测试异常变量是否消失
@@ -187,3 +279,6 @@ if __name__ == '__main__':
 
     # 主流程执行
     process_patient_data()
+
+    # 列式存储的主流程
+    process_patient_columns()
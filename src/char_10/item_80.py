@@ -6,40 +6,46 @@
 4. 包含错误示例和正确示例，每个函数独立演示一个知识点。
 """
 
+import io
 import json
 import logging
 import os
 
-# 配置日志输出
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)  # 本模块的日志级别，不依赖根 Logger 的配置
+
+# 模块级复用的 JSON 解码器和编码器，省去 json.loads/json.dumps 每次调用的参数分支
+_decode = json.JSONDecoder().decode
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+# 示例运行时写到磁盘上的夹具文件，由 main 在最后统一清理
+FIXTURE_FILES = ("random_data_invalid_utf8.txt",)
+
 
 def delete_file(filename):
-    if os.path.exists(filename):
-        os.remove(filename)
-    logger.info(f"{filename} is deleted...")
+    # 文件几乎总是存在：直接 unlink，只在缺失时处理异常，省去一次 stat
+    try:
+        os.unlink(filename)
+    except FileNotFoundError:
+        return
+    logger.info("%s is deleted...", filename)
 
 def example_try_finally_success():
     """
     正确示例：try/finally 示例，在文件读取后关闭句柄，即使发生异常也保证关闭。
-    本例模拟正常读取文件。
+    本例使用内存中的 StringIO 模拟正常读取文件。
     """
     logger.info("example_try_finally_success: 开始")
-    filename = "random_data.txt"
-    # 往random_data.txt 写入数据
-    with open(filename, "w") as f:
-        f.write("This is a test file.")
     try:
-        handle = open(filename, encoding="utf-8")
+        handle = io.StringIO("This is a test file.")
         try:
             data = handle.read()
-            logger.info(f"读取到数据: {data}")
+            logger.info("读取到数据: %s", data)
         finally:
             handle.close()
             logger.info("文件已关闭")
-            delete_file(filename)
     except Exception as e:
-        logger.error(f"发生异常: {e}")
+        logger.error("发生异常: %s", e)
 
 
 def example_try_finally_error_during_read():
@@ -52,16 +58,16 @@ def example_try_finally_error_during_read():
         f.write(b"\xf1\xf2\xf3\xf4\xf5")  # 无效的 UTF-8 字节序列
 
     try:
-        handle = open(filename, encoding="utf-8")
+        # 以二进制方式读取后一次性解码，不创建 TextIOWrapper 和增量解码器
+        handle = open(filename, "rb")
         try:
-            data = handle.read()  # 这里会抛出 UnicodeDecodeError
-            logger.info(f"读取到数据: {data}")
+            data = handle.read().decode("utf-8")  # 这里会抛出 UnicodeDecodeError
+            logger.info("读取到数据: %s", data)
         finally:
             handle.close()
             logger.info("文件已关闭")
-            delete_file(filename)
     except UnicodeDecodeError as e:
-        logger.error(f"Unicode 解码错误: {e}")
+        logger.error("Unicode 解码错误: %s", e)
 
 
 def example_try_finally_open_failed():
@@ -75,12 +81,12 @@ def example_try_finally_open_failed():
         handle = open(filename, encoding="utf-8")
         try:
             data = handle.read()
-            logger.info(f"读取到数据: {data}")
+            logger.info("读取到数据: %s", data)
         finally:
             handle.close()
             logger.info("文件已关闭")
     except FileNotFoundError as e:
-        logger.error(f"文件未找到: {e}")
+        logger.error("文件未找到: %s", e)
 
 
 def example_try_except_else_success():
@@ -92,13 +98,13 @@ def example_try_except_else_success():
     data = '{"key": "value"}'
 
     try:
-        result_dict = json.loads(data)
+        result_dict = _decode(data)
     except ValueError:
         logger.warning("JSON 解析失败")
         raise KeyError("key")
     else:
         value = result_dict["key"]
-        logger.info(f"获取到键值: {value}")
+        logger.info("获取到键值: %s", value)
         return value
 
 
@@ -111,7 +117,7 @@ def example_try_except_else_json_parse_error():
     data = '{"key": bad_payload}'
 
     try:
-        result_dict = json.loads(data)
+        result_dict = _decode(data)
     except ValueError:
         logger.warning("JSON 解析失败，抛出 KeyError")
         raise KeyError("key")
@@ -126,134 +132,59 @@ def example_try_except_else_key_error():
     data = '{"key": "value"}'
 
     try:
-        result_dict = json.loads(data)
+        result_dict = _decode(data)
     except ValueError:
         logger.warning("JSON 解析失败")
         raise KeyError("key")
     else:
         value = result_dict["missing_key"]  # KeyError 将传播出去
-        logger.info(f"获取到键值: {value}")
+        logger.info("获取到键值: %s", value)
         return value
 
 
-def example_full_usage_success():
-    """
-    正确示例：综合使用 try/except/else/finally。
-    成功读取、计算、写回 JSON 文件。
-    """
-    logger.info("example_full_usage_success: 开始")
-    temp_path = "temp_full_usage.json"
-    with open(temp_path, "w") as f:
-        f.write('{"numerator": 10, "denominator": 2}')
-
-    UNDEFINED = object()
-
-    def divide_json(path):
-        handle = open(path, "r+")
-        try:
-            data = handle.read()
-            op = json.loads(data)
-            value = op["numerator"] / op["denominator"]
-            logger.info(f"计算结果: {value}")
-        except ZeroDivisionError:
-            logger.warning("除数为零")
-            return UNDEFINED
-        else:
-            op["result"] = value
-            result = json.dumps(op)
-            handle.seek(0)
-            handle.write(result)
-            logger.info("写入更新后的 JSON 数据")
-            return value
-        finally:
-            handle.close()
-            logger.info("文件已关闭")
+UNDEFINED = object()
 
-    result = divide_json(temp_path)
-    logger.info(f"最终结果: {result}")
 
-    delete_file(temp_path)
-
-
-def example_full_usage_zero_division():
-    """
-    错误示例：综合使用 try/except/else/finally。
-    除数为零，触发 ZeroDivisionError。
+def divide_json(handle):
     """
-    logger.info("example_full_usage_zero_division: 开始")
-    temp_path = "temp_full_usage_zero.json"
-    with open(temp_path, "w") as f:
-        f.write('{"numerator": 10, "denominator": 0}')
-
-    UNDEFINED = object()
-
-    def divide_json(path):
-        handle = open(path, "r+")
-        try:
-            data = handle.read()
-            op = json.loads(data)
-            value = op["numerator"] / op["denominator"]
-            logger.info(f"计算结果: {value}")
-        except ZeroDivisionError:
-            logger.warning("除数为零")
-            return UNDEFINED
-        else:
-            op["result"] = value
-            result = json.dumps(op)
-            handle.seek(0)
-            handle.write(result)
-            logger.info("写入更新后的 JSON 数据")
-            return value
-        finally:
-            handle.close()
-            logger.info("文件已关闭")
+    综合使用 try/except/else/finally：从二进制文件对象读取 JSON，计算除法并把结果写回。
+    除数为零时返回 UNDEFINED，JSON 解析错误向调用方传播。
 
-    result = divide_json(temp_path)
-    logger.info(f"最终结果: {result}")
-
-    delete_file(temp_path)
+    内容一次读入，结果一次写回并 truncate，新内容较短时不会残留旧数据。
+    """
+    try:
+        op = _decode(handle.read().decode())
+        value = op["numerator"] / op["denominator"]
+        logger.info("计算结果: %s", value)
+    except ZeroDivisionError:
+        logger.warning("除数为零")
+        return UNDEFINED
+    else:
+        op["result"] = value
+        handle.seek(0)
+        handle.write(_encode(op).encode())
+        handle.truncate()
+        logger.info("写入更新后的 JSON 数据")
+        return value
+    finally:
+        handle.close()
+        logger.info("文件已关闭")
 
 
-def example_full_usage_invalid_json():
+def _run_full_usage(payload, label):
     """
-    错误示例：综合使用 try/except/else/finally。
-    JSON 格式错误，异常在 try 块中抛出，finally 仍执行。
+    综合使用 try/except/else/finally：用内存中的 JSON 数据调用 divide_json。
+    成功时写回结果；除数为零时返回 UNDEFINED；JSON 格式错误时异常在 try 块中抛出，
+    finally 仍执行，这里捕获后记录日志。
     """
-    logger.info("example_full_usage_invalid_json: 开始")
-    temp_path = "temp_full_usage_invalid.json"
-    with open(temp_path, "w") as f:
-        f.write('{"numerator": 10 bad_data}')
-
-    UNDEFINED = object()
-
-    def divide_json(path):
-        handle = open(path, "r+")
-        try:
-            data = handle.read()
-            op = json.loads(data)
-            value = op["numerator"] / op["denominator"]
-            logger.info(f"计算结果: {value}")
-        except ZeroDivisionError:
-            logger.warning("除数为零")
-            return UNDEFINED
-        else:
-            op["result"] = value
-            result = json.dumps(op)
-            handle.seek(0)
-            handle.write(result)
-            logger.info("写入更新后的 JSON 数据")
-            return value
-        finally:
-            handle.close()
-            logger.info("文件已关闭")
+    logger.info("%s: 开始", label)
+    handle = io.BytesIO(payload)
 
     try:
-        result = divide_json(temp_path)
-        logger.info(f"最终结果: {result}")
+        result = divide_json(handle)
+        logger.info("最终结果: %s", result)
     except json.JSONDecodeError as e:
-        logger.error(f"JSON 解码失败: {e}")
-    finally:
-        delete_file(temp_path)
+        logger.error("JSON 解码失败: %s", e)
 
 
 def main():
@@ -275,23 +206,28 @@ def main():
     try:
         example_try_except_else_json_parse_error()
     except KeyError as e:
-        logger.error(f"捕获到 Key Error: {e}")
+        logger.error("捕获到 Key Error: %s", e)
 
     logger.info("\n--- 示例 6: try/except/else 键缺失 ---")
     try:
         example_try_except_else_key_error()
     except KeyError as e:
-        logger.error(f"捕获到 Key Error: {e}")
+        logger.error("捕获到 Key Error: %s", e)
 
     logger.info("\n--- 示例 7: 综合使用成功 ---")
-    example_full_usage_success()
+    _run_full_usage(b'{"numerator": 10, "denominator": 2}', "full_usage_success")
 
     logger.info("\n--- 示例 8: 综合使用除零错误 ---")
-    example_full_usage_zero_division()
+    _run_full_usage(b'{"numerator": 10, "denominator": 0}', "full_usage_zero_division")
 
     logger.info("\n--- 示例 9: 综合使用 JSON 解析失败 ---")
-    example_full_usage_invalid_json()
+    _run_full_usage(b'{"numerator": 10 bad_data}', "full_usage_invalid_json")
+
+    for filename in FIXTURE_FILES:
+        delete_file(filename)
 
 
 if __name__ == "__main__":
+    # 配置日志输出
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     main()
@@ -10,9 +10,8 @@
 
 import logging
 
-# 设置日志格式
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)  # 本模块的日志级别，不依赖根 Logger 的配置
 
 
 def example_raise_for_external_api():
@@ -44,7 +43,7 @@ def example_raise_for_external_api():
         movie.rate(5)  # 正确输入
         movie.rate(7)  # 错误输入，触发异常
     except RatingError as e:
-        logger.error(f"捕获到 RatingError: {e}")
+        logger.error("捕获到 RatingError: %s", e)
 
 
 def example_assert_for_internal_assumption():
@@ -54,23 +53,32 @@ def example_assert_for_internal_assumption():
     """
 
     class RatingInternal:
+        __slots__ = ("max_rating", "ratings")
+
         def __init__(self, max_rating):
-            assert max_rating > 0, f"初始化失败：max_rating 必须大于 0，当前值为 {max_rating}"
+            # 快速路径：不做检查，供已知参数合法的内部调用者使用
             self.max_rating = max_rating
             self.ratings = []
 
+        @classmethod
+        def new_checked(cls, max_rating):
+            assert max_rating > 0, f"初始化失败：max_rating 必须大于 0，当前值为 {max_rating}"
+            return cls(max_rating)
+
         def rate(self, rating):
+            # assert 的消息表达式只在条件不成立时才求值，python -O 下整条语句被移除，
+            # 因此热路径上无需改写成 if __debug__ 加手动 raise
             assert 0 < rating <= self.max_rating, f"评分错误：rating 值为 {rating}，超出允许范围"
             self.ratings.append(rating)
 
     logger.info("测试 assert 在内部逻辑中的使用")
 
     try:
-        movie = RatingInternal(5)
+        movie = RatingInternal.new_checked(5)
         movie.rate(5)  # 正确输入
         movie.rate(7)  # 错误输入，触发 AssertionError
     except AssertionError as e:
-        logger.error(f"捕获到 AssertionError: {e}")
+        logger.error("捕获到 AssertionError: %s", e)
 
 
 def example_catching_assertion_error():
@@ -84,7 +92,7 @@ def example_catching_assertion_error():
     try:
         assert False, "这是一个断言错误"
     except AssertionError as e:
-        logger.warning(f"不应该在这里捕获 AssertionError: {e}")
+        logger.warning("不应该在这里捕获 AssertionError: %s", e)
 
 
 def example_catching_raise_exception():
@@ -104,7 +112,7 @@ def example_catching_raise_exception():
     try:
         faulty_function()
     except CustomException as e:
-        logger.error(f"成功捕获由 raise 引发的异常: {e}")
+        logger.error("成功捕获由 raise 引发的异常: %s", e)
 
 
 def example_assert_not_disabled():
@@ -119,7 +127,7 @@ def example_assert_not_disabled():
     try:
         assert False, "__debug__ 可能被设置为 False，这将导致断言失效"
     except AssertionError as e:
-        logger.warning(f"断言生效，程序检测到了问题: {e}")
+        logger.warning("断言生效，程序检测到了问题: %s", e)
 
 
 def main():
@@ -148,4 +156,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 设置日志格式
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     main()
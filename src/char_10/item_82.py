@@ -8,14 +8,17 @@
 2. 使用 `contextmanager` 创建自定义上下文管理器。
 3. 演示如何通过 `as` 获取上下文对象。
 4. 包含错误示例和正确示例进行对比。
+5. 需要频繁进出 with 块时，使用带 `__slots__` 的类实现上下文管理器。
 """
 
 import logging
-import os.path
+import os
 from contextlib import contextmanager
 
-# 配置基础日志设置
-logging.basicConfig(level=logging.WARNING, format="%(levelname)s: %(message)s")
+
+# 示例中用到的具名 Logger 在导入时获取一次，避免每次调用都加锁查找
+_MY_LOG = logging.getLogger("my-log")
+_OTHER_LOG = logging.getLogger("other-log")
 
 # 正确示例：使用 with 管理文件资源
 def correct_with_file_usage():
@@ -26,7 +29,7 @@ def correct_with_file_usage():
             f.write("This is some data!")
         logging.info("文件已关闭")
     except Exception as e:
-        logging.error(f"发生异常：{e}")
+        logging.error("发生异常：%s", e)
 
 
 # 错误示例：手动使用 try/finally 管理文件资源
@@ -89,19 +92,67 @@ def correct_contextmanager_with_as_usage():
     logging.info("正确示例：contextmanager 通过 as 提供 Logger 实例")
     with log_level(logging.DEBUG, "my-log") as my_logger:
         my_logger.debug("This debug message should appear for 'my-log'")
-    my_logger = logging.getLogger("my-log")
-    my_logger.debug("This debug message should NOT appear (level restored)")
-    my_logger.error("This error message will always appear")
+    _MY_LOG.debug("This debug message should NOT appear (level restored)")
+    _MY_LOG.error("This error message will always appear")
 
 
 # 错误示例：未使用 as 目标导致无法访问上下文对象
 def incorrect_missing_as_target():
     """未使用 as 目标，无法获取上下文中的对象"""
     logging.info("错误示例：未使用 as 获取上下文对象")
-    logger = logging.getLogger("other-log")
-    logger.setLevel(logging.DEBUG)
-    logger.debug("This debug message appears")
-    logger.setLevel(logging.WARNING)  # 无自动恢复机制，需手动控制
+    _OTHER_LOG.setLevel(logging.DEBUG)
+    _OTHER_LOG.debug("This debug message appears")
+    _OTHER_LOG.setLevel(logging.WARNING)  # 无自动恢复机制，需手动控制
+
+
+# 正确示例：热路径上使用类实现的上下文管理器
+class DebugLogging:
+    """
+    与 debug_logging 等价的类实现。
+
+    直接实现 __enter__/__exit__，省去 contextmanager 包装生成器、调用 next()
+    和处理 StopIteration 的开销，适合在循环中反复进出 with 块。
+    """
+    __slots__ = ("_level", "_old_level", "_logger")
+
+    def __init__(self, level):
+        self._level = level
+        self._logger = logging.getLogger()
+
+    def __enter__(self):
+        self._old_level = self._logger.getEffectiveLevel()
+        self._logger.setLevel(self._level)
+
+    def __exit__(self, *exc_info):
+        self._logger.setLevel(self._old_level)
+
+
+class LogLevel:
+    """与 log_level 等价的类实现，__enter__ 返回 Logger 供 as 目标使用。"""
+    __slots__ = ("_level", "_old_level", "_logger")
+
+    def __init__(self, level, name):
+        self._level = level
+        self._logger = logging.getLogger(name)
+
+    def __enter__(self):
+        self._old_level = self._logger.getEffectiveLevel()
+        self._logger.setLevel(self._level)
+        return self._logger
+
+    def __exit__(self, *exc_info):
+        self._logger.setLevel(self._old_level)
+
+
+def correct_class_context_manager_usage():
+    """在循环中反复使用类实现的上下文管理器临时修改日志级别"""
+    logging.info("正确示例：循环中使用类实现的上下文管理器")
+    for i in range(3):
+        with DebugLogging(logging.DEBUG):
+            logging.debug("Debug message %d should appear", i)
+        with LogLevel(logging.DEBUG, "my-log") as my_logger:
+            my_logger.debug("Debug message %d should appear for 'my-log'", i)
+    logging.debug("This debug message should NOT appear (level restored)")
 
 
 # 主函数：运行所有示例
@@ -126,11 +177,18 @@ def main():
     logging.info("\n=== 示例 6：错误忽略 as 目标 ===")
     incorrect_missing_as_target()
 
-    if os.path.exists("example.txt"):
+    logging.info("\n=== 示例 7：循环中使用类实现的上下文管理器 ===")
+    correct_class_context_manager_usage()
+
+    try:
         os.remove("example.txt")
+    except FileNotFoundError:
+        pass
 
     logging.info("\n示例程序执行完毕")
 
 
 if __name__ == "__main__":
+    # 配置基础日志设置
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s: %(message)s")
     main()
@@ -11,9 +11,6 @@
 
 import logging
 
-# 配置 logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
 
 class RpcError(Exception):
     """模拟远程调用错误"""
@@ -76,7 +73,7 @@ def good_example_separate_try():
     try:
         request = lookup_request(connection)
     except RpcError as e:
-        logging.error(f"lookup_request failed: {e}")
+        logging.error("lookup_request failed: %s", e)
         close_connection(connection)
         return
 
@@ -84,7 +81,7 @@ def good_example_separate_try():
         if is_cached(connection, request):
             request = None
     except RpcError as e:
-        logging.error(f"is_cached failed: {e}")
+        logging.error("is_cached failed: %s", e)
         close_connection(connection)
         return
 
@@ -105,7 +102,7 @@ def good_example_with_else():
     try:
         request = lookup_request(connection)
     except RpcError as e:
-        logging.error(f"lookup_request failed: {e}")
+        logging.error("lookup_request failed: %s", e)
         close_connection(connection)
         return
     else:
@@ -114,7 +111,7 @@ def good_example_with_else():
             if is_cached(connection, request):
                 request = None
         except RpcError as e:
-            logging.error(f"is_cached failed: {e}")
+            logging.error("is_cached failed: %s", e)
             close_connection(connection)
             return
 
@@ -137,4 +134,6 @@ def main():
 
 
 if __name__ == '__main__':
+    # 配置 logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     main()
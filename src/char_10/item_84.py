@@ -11,9 +11,6 @@
 
 import logging
 
-# 配置日志输出
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
 
 # 示例 1: 异常变量在 except 块外不可用
 def example_1():
@@ -23,12 +20,12 @@ def example_1():
     try:
         raise ValueError("这是一个 ValueError")
     except ValueError as e:
-        logging.info(f"Inside except block: {e}")
+        logging.info("Inside except block: %s", e)
     # 下面这行会引发 NameError，因为 e 只在 except 块内有效
     try:
-        logging.info(f"Outside except block: {e}")
+        logging.info("Outside except block: %s", e)
     except NameError as ne:
-        logging.error(f"捕获到 NameError：{ne}")
+        logging.error("捕获到 NameError：%s", ne)
 
 
 # 示例 2: 异常变量在 finally 块中也无法访问
@@ -39,12 +36,12 @@ def example_2():
     try:
         raise TypeError("这是一个 TypeError")
     except TypeError as e:
-        logging.info(f"Inside except block: {e}")
+        logging.info("Inside except block: %s", e)
     finally:
         try:
-            logging.info(f"Inside finally block: {e}")
+            logging.info("Inside finally block: %s", e)
         except NameError as ne:
-            logging.error(f"捕获到 NameError：{ne}")
+            logging.error("捕获到 NameError：%s", ne)
 
 
 # 示例 3: 正确保存异常信息以供后续使用（推荐做法）
@@ -62,7 +59,7 @@ def example_3():
     else:
         result = "Success"
     finally:
-        logging.info(f"Log result={result}")
+        logging.info("Log result=%s", result)
 
 
 # 示例 4: 不提前定义 result 变量导致的问题
@@ -78,9 +75,9 @@ def example_4():
         result = "Success"
     finally:
         try:
-            logging.info(f"Result is: {result}")
+            logging.info("Result is: %s", result)
         except NameError as ne:
-            logging.error(f"捕获到 NameError：{ne}")
+            logging.error("捕获到 NameError：%s", ne)
 
 
 # 主函数，运行所有示例
@@ -99,4 +96,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 配置日志输出
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     main()
@@ -14,9 +14,6 @@
 
 import logging
 
-# 配置日志系统
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
 
 # -----------------------------
 # 示例 1：基本错误捕获（仅捕获特定异常）
@@ -47,7 +44,7 @@ def example_specific_exception_handling():
     """
     try:
         summary = run_report_good("nonexistent_file.txt")
-        logging.info(f"报告生成成功: {summary}")
+        logging.info("报告生成成功: %s", summary)
     except FileNotFoundError:
         logging.warning("警告：数据文件未找到，可能是临时问题。")
 
@@ -73,7 +70,7 @@ def example_broad_exception_catching():
     """
     try:
         summary = run_report_bad("some_file.txt")
-        logging.info(f"报告生成成功: {summary}")
+        logging.info("报告生成成功: %s", summary)
     except Exception:
         logging.error("发生异常：可能是临时问题或代码错误被掩盖")
 
@@ -89,9 +86,9 @@ def example_broad_exception_with_details():
     """
     try:
         summary = run_report_bad("some_file.txt")
-        logging.info(f"报告生成成功: {summary}")
+        logging.info("报告生成成功: %s", summary)
     except Exception as e:
-        logging.error(f"捕获到异常: 类型={type(e).__name__}, 消息={str(e)}")
+        logging.error("捕获到异常: 类型=%s, 消息=%s", type(e).__name__, e)
 
 
 # -----------------------------
@@ -113,17 +110,18 @@ def run_report_multiple_exceptions(path):
 def example_multiple_specific_exceptions():
     """
     推荐做法：明确捕获多个具体异常类型，
-    并对每种异常进行不同的处理。
+    并对每种异常进行不同的处理。except 子句自上而下依次匹配，
+    最常见的数据格式错误放在最前面；互不相交的具体类型调换顺序不影响结果。
     """
     try:
         summary = run_report_multiple_exceptions("invalid_data.txt")
-        logging.info(f"报告生成成功: {summary}")
+        logging.info("报告生成成功: %s", summary)
+    except ValueError as ve:
+        logging.error("数据错误: %s", ve)
     except FileNotFoundError:
         logging.warning("警告：数据文件未找到")
-    except ValueError as ve:
-        logging.error(f"数据错误: {ve}")
     except Exception as e:
-        logging.critical(f"未知异常: {e}")
+        logging.critical("未知异常: %s", e)
 
 
 # -----------------------------
@@ -145,4 +143,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 配置日志系统
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     main()
@@ -8,16 +8,16 @@
 4. 错误地捕获 `BaseException` 可能会导致程序行为异常。
 5. 正确传播异常（如使用裸 raise）。
 6. 在装饰器等工具中处理所有类型的异常时需要捕获 `BaseException`。
+7. 装饰器可以在装饰时按被装饰函数的签名选择更快的包装函数。
 
 该文件遵循 PEP8 规范，并使用 logging 替代 print 输出日志信息。
 """
 
+import inspect
 import logging
 import sys
 import functools
 
-# 配置 logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # 示例 1: 捕获 Exception 并无法处理 BaseException 子类（错误示例）
 def example_1_do_processing():
@@ -28,7 +28,7 @@ def example_1_main():
     try:
         example_1_do_processing()
     except Exception as e:
-        logging.info(f"捕获到异常：{type(e)} - {e}")
+        logging.info("捕获到异常：%s - %s", type(e), e)
 
     return 0
 
@@ -43,7 +43,7 @@ def example_2_main():
     try:
         example_2_do_processing()
     except Exception as e:
-        logging.info(f"捕获到普通异常：{type(e)} - {e}")
+        logging.info("捕获到普通异常：%s - %s", type(e), e)
     except BaseException as be:
         logging.warning("检测到 BaseException，正在清理...")
         handle.flush()
@@ -66,7 +66,7 @@ def example_3_main():
     try:
         example_3_do_processing()
     except Exception as e:
-        logging.info(f"捕获到普通异常：{type(e)} - {e}")
+        logging.info("捕获到普通异常：%s - %s", type(e), e)
     finally:
         logging.info("无论何种异常都会执行清理操作")
         handle.flush()
@@ -81,7 +81,7 @@ def example_4_do_processing():
 
 
 def example_4_input(prompt):
-    logging.info(f"{prompt}y")
+    logging.info("%sy", prompt)
     return "y"
 
 
@@ -89,7 +89,7 @@ def example_4_main():
     try:
         example_4_do_processing()
     except Exception as e:
-        logging.info(f"捕获到普通异常：{type(e)} - {e}")
+        logging.info("捕获到普通异常：%s - %s", type(e), e)
     except KeyboardInterrupt:
         user_choice = example_4_input("确定要终止程序吗？[y/n]: ")
         if user_choice == 'y':
@@ -110,7 +110,7 @@ def log_error_only(func):
             result = e
             raise
         finally:
-            logging.info(f"Called {func.__name__}(*{args!r}, **{kwargs!r}) got {result!r}")
+            logging.info("Called %s(*%r, **%r) got %r", func.__name__, args, kwargs, result)
         return result
     return wrapper
 
@@ -123,16 +123,19 @@ def example_5_func(x):
 
 # 示例 6: 改进版日志记录装饰器 - 正确处理 BaseException（正确示例）
 def log_all_exceptions(func):
+    # 装饰时绑定一次级别检查；INFO 被过滤时完全跳过 args/kwargs 的 repr
+    is_enabled_for = logging.getLogger().isEnabledFor
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        result = None
         try:
             result = func(*args, **kwargs)
         except BaseException as be:
-            result = be
+            if is_enabled_for(logging.INFO):
+                logging.info("Called %s(*%r, **%r) got %r", func.__name__, args, kwargs, be)
             raise
-        finally:
-            logging.info(f"Called {func.__name__}(*{args!r}, **{kwargs!r}) got {result!r}")
+        if is_enabled_for(logging.INFO):
+            logging.info("Called %s(*%r, **%r) got %r", func.__name__, args, kwargs, result)
         return result
     return wrapper
 
@@ -143,13 +146,51 @@ def example_6_func(x):
         sys.exit(1)
 
 
+# 示例 7: 按签名特化的日志记录装饰器
+def log_all_exceptions_fast(func):
+    """
+    与 log_all_exceptions 行为相同，但在装饰时检查签名：被装饰函数恰好只有一个
+    没有默认值的仅限位置参数（用 / 声明）时，返回只接收一个位置参数的包装函数，
+    省去每次调用打包 *args 元组和 **kwargs 字典；其他签名退回通用版本。
+    普通的位置或关键字参数不能特化，否则按参数名传参的调用会失败。
+    """
+    params = list(inspect.signature(func).parameters.values())
+    if not (
+        len(params) == 1
+        and params[0].kind is inspect.Parameter.POSITIONAL_ONLY
+        and params[0].default is inspect.Parameter.empty
+    ):
+        return log_all_exceptions(func)
+
+    is_enabled_for = logging.getLogger().isEnabledFor
+
+    @functools.wraps(func)
+    def wrapper(x):
+        try:
+            result = func(x)
+        except BaseException as be:
+            if is_enabled_for(logging.INFO):
+                logging.info("Called %s(%r) got %r", func.__name__, x, be)
+            raise
+        if is_enabled_for(logging.INFO):
+            logging.info("Called %s(%r) got %r", func.__name__, x, result)
+        return result
+    return wrapper
+
+
+@log_all_exceptions_fast
+def example_7_func(x, /):
+    if x > 0:
+        sys.exit(1)
+
+
 # 主函数运行所有示例
 def main():
     logging.info("开始运行示例 1：捕获 Exception 并无法处理 BaseException 子类（错误示例）")
     try:
         example_1_main()
     except BaseException as e:
-        logging.error(f"示例1出现未处理的异常：{e}")
+        logging.error("示例1出现未处理的异常：%s", e)
 
     logging.info("\n开始运行示例 2：使用 BaseException 捕获并进行清理（不推荐方式）")
     try:
@@ -181,6 +222,15 @@ def main():
     except SystemExit:
         logging.warning("示例6触发了 SystemExit 并被完整记录")
 
+    logging.info("\n开始运行示例 7：按签名特化的日志记录装饰器（单参数快速路径）")
+    example_7_func(0)
+    try:
+        example_7_func(100)
+    except SystemExit:
+        logging.warning("示例7触发了 SystemExit 并被完整记录")
+
 
 if __name__ == "__main__":
+    # 配置 logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     sys.exit(main())
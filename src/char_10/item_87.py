@@ -15,9 +15,40 @@
 import logging
 import traceback
 import json
+import tempfile
+from pathlib import Path
+
+# 模块级复用的 JSON 编码器；紧凑分隔符去掉多余空格，减少写入的字节数
+_JSON_ENCODE = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def frame_names(tb):
+    """
+    沿 tb_next 链表收集每一帧的函数名。
+
+    只读取代码对象的 co_name，不像 extract_tb 那样通过 linecache 读取源文件。
+    """
+    names = []
+    while tb is not None:
+        names.append(tb.tb_frame.f_code.co_name)
+        tb = tb.tb_next
+    return names
+
+
+class _Request:
+    """示例 2~4 共用的请求对象，定义在模块级，避免每次调用示例都重新创建类。"""
+
+    __slots__ = ("body", "response")
+
+    def __init__(self, body):
+        self.body = body
+        self.response = None
+
+
+def _do_work(data):
+    """示例 2~5 共用的出错函数。"""
+    assert False, data
 
-# 配置日志系统
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # ==============================
 # 示例 1：默认的异常堆栈跟踪输出
@@ -52,22 +83,14 @@ def example_catch_without_traceback():
     当异常被捕获但只打印 repr(e)，无法获取完整的堆栈跟踪，调试困难。
     """
 
-    class Request:
-        def __init__(self, body):
-            self.body = body
-            self.response = None
-
-    def do_work(data):
-        assert False, data
-
     def handle(request):
         try:
-            do_work(request.body)
+            _do_work(request.body)
         except BaseException as e:
-            logging.warning("仅打印异常字符串表示: %s", repr(e))
+            logging.warning("仅打印异常字符串表示: %r", e)
             request.response = 400  # 错误请求
 
-    request = Request("My message")
+    request = _Request("My message")
     handle(request)
     logging.info("响应状态码: %d", request.response)
 
@@ -82,24 +105,16 @@ def example_print_traceback():
     使用 traceback.print_tb() 显式打印堆栈跟踪信息，帮助定位问题源头。
     """
 
-    class Request:
-        def __init__(self, body):
-            self.body = body
-            self.response = None
-
-    def do_work(data):
-        assert False, data
-
     def handle2(request):
         try:
-            do_work(request.body)
+            _do_work(request.body)
         except BaseException as e:
             logging.error("异常发生，正在打印堆栈跟踪:")
             traceback.print_tb(e.__traceback__)
-            logging.warning("异常内容: %s", repr(e))
+            logging.warning("异常内容: %r", e)
             request.response = 400
 
-    request = Request("My message 2")
+    request = _Request("My message 2")
     handle2(request)
     logging.info("响应状态码: %d", request.response)
 
@@ -111,29 +126,23 @@ def example_print_traceback():
 def example_extract_function_names():
     """
     示例说明：
-    使用 traceback.extract_tb() 提取堆栈帧中的函数名，用于分析调用链。
+    沿 traceback 链表提取堆栈帧中的函数名，用于分析调用链。
+    只需要函数名时不必使用 traceback.extract_tb()，省去读取源码行的开销。
     """
 
-    class Request:
-        def __init__(self, body):
-            self.body = body
-            self.response = None
-
-    def do_work(data):
-        assert False, data
-
     def handle3(request):
         try:
-            do_work(request.body)
+            _do_work(request.body)
         except BaseException as e:
-            stack = traceback.extract_tb(e.__traceback__)
-            logging.info("异常堆栈中的函数名:")
-            for frame in stack:
-                logging.info("- %s", frame.name)
-            logging.warning("异常内容: %s", repr(e))
+            # INFO 被过滤时不遍历 traceback
+            if logging.getLogger().isEnabledFor(logging.INFO):
+                logging.info("异常堆栈中的函数名:")
+                for name in frame_names(e.__traceback__):
+                    logging.info("- %s", name)
+            logging.warning("异常内容: %r", e)
             request.response = 400
 
-    request = Request("My message 3")
+    request = _Request("My message 3")
     handle3(request)
     logging.info("响应状态码: %d", request.response)
 
@@ -146,40 +155,34 @@ def example_log_to_file():
     """
     示例说明：
     使用 traceback 模块提取堆栈信息，并将异常信息格式化为 JSON 写入日志文件。
+    日志文件只打开一次，由调用者把句柄传给 log_if_error，不再每条记录都打开、关闭文件。
+    日志写在独立的临时目录中，多个进程同时运行示例时不会互相覆盖，结束后自动清理。
     """
 
-    import os
-
-    LOG_FILE = "my_log.jsonl"
 
-    if os.path.exists(LOG_FILE):
-        os.remove(LOG_FILE)  # 清空旧日志
-
-    def log_if_error(file_path, target, *args, **kwargs):
+    def log_if_error(log_file, target, *args, **kwargs):
         try:
             target(*args, **kwargs)
         except BaseException as e:
-            stack = traceback.extract_tb(e.__traceback__)
-            stack_without_wrapper = stack[1:]  # 去除 wrapper 自身的堆栈帧
+            # 从 tb_next 开始遍历，直接跳过 wrapper 自身的堆栈帧，无需再切片
+            stack_without_wrapper = frame_names(e.__traceback__.tb_next)
             trace_dict = {
-                'stack': [item.name for item in stack_without_wrapper],
+                'stack': stack_without_wrapper,
                 'error_type': type(e).__name__,
                 'error_message': str(e),
             }
-            json_data = json.dumps(trace_dict, ensure_ascii=False)
-            with open(file_path, "a", encoding="utf-8") as f:
-                f.write(json_data + "\n")
-
-    def do_work(data):
-        assert False, data
+            log_file.write(_JSON_ENCODE(trace_dict) + "\n")
 
-    log_if_error(LOG_FILE, do_work, "First error")
-    log_if_error(LOG_FILE, do_work, "Second error")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        log_path = Path(tmpdir) / "my_log.jsonl"
+        with open(log_path, "w", encoding="utf-8", buffering=1 << 16) as log_file:
+            log_if_error(log_file, _do_work, "First error")
+            log_if_error(log_file, _do_work, "Second error")
 
-    logging.info("已写入异常日志至 %s", LOG_FILE)
-    with open(LOG_FILE, "r", encoding="utf-8") as f:
-        for line in f:
-            logging.info("读取日志: %s", line.strip())
+        logging.info("已写入异常日志至 %s", log_path)
+        # 一次 read() 读回全部内容，再按行拆分
+        for line in log_path.read_text(encoding="utf-8").splitlines():
+            logging.info("读取日志: %s", line)
 
 
 # ==============================
@@ -207,4 +210,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 配置日志系统
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     main()
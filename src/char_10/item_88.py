@@ -11,7 +11,6 @@
 """
 
 import logging
-from traceback import extract_tb
 
 # 设置日志记录器
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -91,23 +90,28 @@ def nested_exception_handling():
 def custom_exception_with_context():
     """
     演示手动访问异常的 __context__ 和 __cause__ 属性，
-    以及如何通过 traceback 提取完整的异常链。
+    以及如何沿 traceback 链表输出完整的异常链。
     """
     def get_cause(exc):
-        if exc.__cause__ is not None:
-            return exc.__cause__
-        elif not exc.__suppress_context__:
-            return exc.__context__
-        else:
+        cause = exc.__cause__  # 只读取一次属性
+        if cause is not None:
+            return cause
+        if exc.__suppress_context__:
             return None
+        return exc.__context__
 
     try:
         nested_exception_handling()
     except Exception as e:
         while e is not None:
-            stack = extract_tb(e.__traceback__)
-            for i, frame in enumerate(stack, 1):
-                logger.info(f"{i} {frame.line}")
+            # 直接沿 tb_next 读取函数名和行号，不通过 linecache 读取源文件；
+            # 整条堆栈拼成一条日志，只调用一次 handler
+            tb = e.__traceback__
+            lines = []
+            while tb is not None:
+                lines.append(f"{len(lines) + 1} {tb.tb_frame.f_code.co_name}:{tb.tb_lineno}")
+                tb = tb.tb_next
+            logger.info("\n".join(lines))
             e = get_cause(e)
             if e:
                 logger.info("Caused by")
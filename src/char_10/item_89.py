@@ -11,6 +11,7 @@
 
 import logging
 import gc
+import os
 import sys
 import random
 
@@ -18,6 +19,20 @@ import random
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 示例 6、7 共用的数据文件
+FIXTURE_PATH = "my_file.txt"
+
+
+def _ensure_fixture_file(path):
+    """文件不存在时生成 20 行随机长度的数据，整块内容一次写入。"""
+    if os.path.exists(path):
+        return
+    # 一次 random.choices 调用生成全部行长，代替逐行调用 randint
+    sizes = random.choices(range(101), k=20)
+    content = "\n".join("a" * size for size in sizes) + "\n"
+    with open(path, "w") as f:
+        f.write(content)
+
 
 def example_normal_function_finally():
     """
@@ -54,8 +69,10 @@ def example_generator_with_finally():
 
     # 完整迭代生成器
     logger.info("完整迭代生成器")
+    produced = []
     for i in my_generator():
-        logger.info(f"生成器产出值: {i}")
+        produced.append(i)
+    logger.info("生成器产出值: %s", produced)
 
     # 部分迭代生成器
     logger.info("部分迭代生成器")
@@ -144,21 +161,21 @@ def example_wrong_way_pass_path_to_generator():
     """
     logger.info("进入 wrong_way_pass_path_to_generator 示例")
 
-    with open("my_file.txt", "w") as f:
-        for _ in range(20):
-            f.write("a" * random.randint(0, 100) + "\n")
+    _ensure_fixture_file(FIXTURE_PATH)
 
     def lengths_path(path):
+        log_lines = logger.isEnabledFor(logging.INFO)  # 循环外只检查一次日志级别
         try:
             with open(path) as handle:
                 for i, line in enumerate(handle):
-                    logger.info(f"Line {i}")
+                    if log_lines:
+                        logger.info("Line %d", i)
                     yield len(line.strip())
         finally:
             logger.info("Finally lengths_path 执行")
 
     max_head = 0
-    it = lengths_path("my_file.txt")
+    it = lengths_path(FIXTURE_PATH)
 
     for i, length in enumerate(it):
         if i == 5:
@@ -179,20 +196,22 @@ def example_correct_way_pass_handle_to_generator():
     """
     logger.info("进入 correct_way_pass_handle_to_generator 示例")
 
-    with open("my_file.txt", "w") as f:
-        for _ in range(20):
-            f.write("a" * random.randint(0, 100) + "\n")
+    _ensure_fixture_file(FIXTURE_PATH)
 
     def lengths_handle(handle):
+        log_lines = logger.isEnabledFor(logging.INFO)
         try:
             for i, line in enumerate(handle):
-                logger.info(f"Line {i}")
-                yield len(line.strip())
+                if log_lines:
+                    logger.info("Line %d", i)
+                # 只减去末尾换行符，不为 strip() 分配新字符串
+                n = len(line)
+                yield n - 1 if line.endswith("\n") else n
         finally:
             logger.info("Finally lengths_handle 执行")
 
     max_head = 0
-    with open("my_file.txt") as handle:
+    with open(FIXTURE_PATH) as handle:
         it = lengths_handle(handle)
         for i, length in enumerate(it):
             if i == 5:
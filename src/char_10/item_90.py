@@ -16,6 +16,35 @@ import logging
 # 配置日志输出
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# 自定义调试开关：模块级常量，导入时确定，不在每次调用时重新创建
+ENABLE_DEBUG = True
+DEBUG_ITEMS = (1, 2, 3)
+
+
+def custom_expensive_check(x):
+    logging.info("执行 custom_expensive_check(%s)", x)
+    return x != 2
+
+
+def expensive_check(x):
+    logging.info("正在执行 expensive_check(%s)", x)
+    return x != 2
+
+
+# 在模块加载时根据 __debug__ 选定实现：-O 模式下的版本不含循环和 try/except，
+# 调用时无需再判断
+if __debug__:
+    def _run_checks(items):
+        for i in items:
+            try:
+                logging.info("执行 assert expensive_check(%s), f'Failed {i=}'", i)
+                assert expensive_check(i), f"Failed {i=}"
+            except AssertionError as e:
+                logging.error("捕获到 AssertionError: %s", e)
+else:
+    def _run_checks(items):
+        logging.info("当前处于优化模式 (__debug__ == False)，跳过 expensive_check")
+
 
 def example_assert_basic():
     """
@@ -34,24 +63,11 @@ def example_assert_basic():
 def example_debug_flag_control_expensive_check():
     """
     示例2：使用 `__debug__` 来控制昂贵的验证逻辑。
-    只有在 debug 模式下才会执行这些检查。
+    只有在 debug 模式下才会执行这些检查，具体实现 _run_checks 在模块加载时选定。
     """
 
-    def expensive_check(x):
-        logging.info(f"正在执行 expensive_check({x})")
-        return x != 2
-
     items = [1, 2, 3]
-
-    if __debug__:
-        for i in items:
-            try:
-                logging.info(f"执行 assert expensive_check({i}), f'Failed {i=}'")
-                assert expensive_check(i), f"Failed {i=}"
-            except AssertionError as e:
-                logging.error(f"捕获到 AssertionError: {e}")
-    else:
-        logging.info("当前处于优化模式 (__debug__ == False)，跳过 expensive_check")
+    _run_checks(items)
 
 
 def example_run_with_optimized_mode():
@@ -92,21 +108,13 @@ def example_custom_debug_flag():
     便于控制调试行为，且不会受到 -O 参数影响。
     """
 
-    enable_debug = True  # 自定义调试开关
-
-    def custom_expensive_check(x):
-        logging.info(f"执行 custom_expensive_check({x})")
-        return x != 2
-
-    items = [1, 2, 3]
-
-    if enable_debug:
-        for i in items:
-            try:
-                logging.info(f"执行 assert custom_expensive_check({i}), f'Check failed {i=}'")
-                assert custom_expensive_check(i), f"Check failed {i=}"
-            except AssertionError as e:
-                logging.error(f"捕获到 AssertionError: {e}")
+    if ENABLE_DEBUG:
+        # 找到第一个未通过检查的元素后立即停止，不再逐个记录 assert 日志
+        failed = next((i for i in DEBUG_ITEMS if not custom_expensive_check(i)), None)
+        try:
+            assert failed is None, f"Check failed i={failed}"
+        except AssertionError as e:
+            logging.error("捕获到 AssertionError: %s", e)
     else:
         logging.info("自定义调试关闭，跳过 expensive check")
 
@@ -18,6 +18,21 @@ import importlib.util
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 示例中反复执行的源码在模块加载时只编译一次，之后直接传入代码对象，
+# 避免每次调用 eval/exec 时重新解析与编译字符串
+_EVAL_CODE = compile("1 + 2 * 3", "<item_91>", "eval")
+
+_EXEC_CODE = compile(
+    """
+if my_condition:
+    x = 'yes'
+else:
+    x = 'no'
+    """,
+    "<item_91>",
+    "exec",
+)
+
 
 def example_eval_basic_usage():
     """
@@ -26,7 +41,7 @@ def example_eval_basic_usage():
     """
     logger.info("=== 示例 1: eval 基本用法 ===")
     try:
-        result = eval("1 + 2 * 3")
+        result = eval(_EVAL_CODE)
         logger.info(f"eval('1 + 2 * 3') 返回结果: {result}")
     except Exception as e:
         logger.error(f"eval 执行出错: {e}")
@@ -63,14 +78,8 @@ def example_exec_basic_usage():
     global_scope = {"my_condition": True}
     local_scope = {}
 
-    exec_code = """
-if my_condition:
-    x = 'yes'
-else:
-    x = 'no'
-    """
-
-    exec(exec_code, global_scope, local_scope)
+    # _EXEC_CODE 是预先编译好的多行代码块（见模块顶部）
+    exec(_EXEC_CODE, global_scope, local_scope)
 
     logger.info(f"exec 执行后 local_scope 内容: {local_scope}")
 
@@ -5,15 +5,23 @@
 主要内容包括：
 - 错误示例：低效的插入排序实现。
 - 正确示例：使用 bisect 模块优化插入排序。
+- 更进一步：直接使用 C 实现的内置 sorted（Timsort）。
 - 分析工具使用：cProfile 进行性能剖析，pstats 打印统计信息、调用者和被调用者关系。
+- 采样剖析：cProfile 会在每次函数调用时触发钩子，若瓶颈本身就是调用次数（如低效插入排序），
+  统计结果会被放大；此时可用 profile_sampled 定期采样调用栈，开销只与采样次数相关。
 """
 
+import argparse
 import logging
 from sys import stdout as STDOUT
 from cProfile import Profile
 from pstats import Stats
 from bisect import bisect_left
 import random
+import sys
+import threading
+import timeit
+from collections import Counter
 
 
 # 配置日志输出
@@ -68,6 +76,14 @@ def insertion_sort_fast(data):
     return result
 
 
+def builtin_sort(data):
+    """
+    直接使用内置 sorted：排序循环全部在 C 中完成，
+    不再为每个元素执行 Python 字节码和 list.insert 的内存移动。
+    """
+    return sorted(data)
+
+
 # -------------------------------
 # 示例 3: 公共函数被频繁调用的情况
 # -------------------------------
@@ -110,56 +126,97 @@ def my_program():
 # 主运行函数
 # -------------------------------
 
-def run_performance_analysis():
-    """
-    对各个示例运行性能分析，并打印结果。
-    """
-
-    # 生成测试数据
-    max_size = 12 ** 4
-    data = [random.randint(0, max_size) for _ in range(max_size)]
+# 每份统计结果最多打印的行数
+PRINT_LIMIT = 20
 
-    # 测试低效插入排序
-    logging.info("开始分析低效插入排序...")
-    test_slow = lambda: insertion_sort_slow(data)
-    profiler = Profile()
-    profiler.runcall(test_slow)
 
+def profile_call(func, *args):
+    """
+    只在调用 func 期间启用剖析器，返回整理好的 Stats。
+    builtins=False 不记录 C 内置函数，减少剖析开销和输出噪声。
+    """
+    with Profile(builtins=False) as profiler:
+        func(*args)
     stats = Stats(profiler, stream=STDOUT)
     stats.strip_dirs()
     stats.sort_stats("cumulative")
-    logging.info("低效插入排序性能分析结果:")
-    stats.print_stats()
+    return stats
 
-    # 测试高效插入排序
-    logging.info("开始分析高效插入排序...")
-    test_fast = lambda: insertion_sort_fast(data)
-    profiler = Profile()
-    profiler.runcall(test_fast)
 
-    stats = Stats(profiler, stream=STDOUT)
-    stats.strip_dirs()
-    stats.sort_stats("cumulative")
-    logging.info("高效插入排序性能分析结果:")
-    stats.print_stats()
+def profile_sampled(func, *args, hz=1000):
+    """
+    采样剖析：后台线程按 hz 频率读取调用线程当前的栈帧，
+    统计每个函数出现在栈顶的次数，返回 Counter。
 
-    # 测试函数调用链
-    logging.info("开始分析函数调用链...")
-    profiler = Profile()
-    profiler.runcall(my_program)
+    不安装任何调用钩子，被测函数的调用开销不受影响。
+    采样线程需要先拿到 GIL，实际采样频率可能低于 hz。
+    """
+    target = threading.get_ident()
+    interval = 1 / hz
+    hits = Counter()
+    done = threading.Event()
 
-    stats = Stats(profiler, stream=STDOUT)
-    stats.strip_dirs()
-    stats.sort_stats("cumulative")
+    def sampler():
+        while not done.wait(interval):
+            frame = sys._current_frames().get(target)
+            if frame is not None:
+                hits[frame.f_code.co_qualname] += 1
+
+    thread = threading.Thread(target=sampler, daemon=True)
+    thread.start()
+    try:
+        func(*args)
+    finally:
+        done.set()
+        thread.join()
+    return hits
+
+
+def run_performance_analysis(include_slow=False):
+    """
+    对各个示例运行性能分析，并打印结果。
+    include_slow 为 True 时才剖析低效插入排序。
+    耗时用 timeit 在不开剖析器的情况下测量，剖析只用于查看调用关系。
+    """
+
+    # 生成测试数据
+    max_size = 12 ** 4
+    # 一次 random.choices 调用批量生成，避免逐个调用 randint
+    data = random.choices(range(max_size + 1), k=max_size)
+
+    sorts = [("高效插入排序", insertion_sort_fast), ("内置 sorted", builtin_sort)]
+    # 低效插入排序：O(n^2) 的 Python 级扫描耗时较长，只在 include_slow 时运行
+    if include_slow:
+        sorts.insert(0, ("低效插入排序", insertion_sort_slow))
+    else:
+        logging.info("跳过低效插入排序（使用 --slow 运行以进行对比）")
+
+    for name, sort_func in sorts:
+        elapsed = timeit.timeit(lambda: sort_func(data), number=1)
+        logging.info("%s耗时: %.4f 秒", name, elapsed)
+
+        logging.info("开始分析%s...", name)
+        stats = profile_call(sort_func, data)
+        logging.info("%s性能分析结果:", name)
+        stats.print_stats(PRINT_LIMIT)
+
+        hits = profile_sampled(sort_func, data)
+        logging.info("%s采样结果（共 %d 次采样）:", name, hits.total())
+        for func_name, count in hits.most_common(PRINT_LIMIT):
+            logging.info("  %6d  %s", count, func_name)
+
+    # 测试函数调用链：同一份 Stats 用于打印统计、调用者和被调用者
+    logging.info("开始分析函数调用链...")
+    stats = profile_call(my_program)
 
     logging.info("函数调用链性能分析结果 (调用次数/时间消耗):")
-    stats.print_stats()
+    stats.print_stats(PRINT_LIMIT)
 
     logging.info("展示哪个函数调用了 my_utility:")
-    stats.print_callers()
+    stats.print_callers(PRINT_LIMIT)
 
     logging.info("展示 my_utility 被哪些函数调用:")
-    stats.print_callees()
+    stats.print_callees(PRINT_LIMIT)
 
 
 # -------------------------------
@@ -167,6 +224,14 @@ def run_performance_analysis():
 # -------------------------------
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run cProfile examples")
+    parser.add_argument(
+        "--slow",
+        action="store_true",
+        help="同时剖析线性扫描的低效插入排序，与 bisect 版本对比",
+    )
+    args = parser.parse_args()
+
     logging.info("开始运行性能分析示例...")
-    run_performance_analysis()
+    run_performance_analysis(include_slow=args.slow)
     logging.info("性能分析示例运行结束。")
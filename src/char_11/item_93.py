@@ -3,7 +3,7 @@
 包含以下示例：
 1. 基础使用：测量简单加法操作的性能。
 2. 错误使用：迭代次数太少导致结果不可靠。
-3. 正确使用：显式指定迭代次数并计算平均耗时。
+3. 正确使用：由 Timer.autorange 自动确定迭代次数，取多轮最小值并计算平均耗时。
 4. 使用 setup 隔离初始化代码：测试 `list` 和 `set` 中成员检查的性能差异。
 5. 测试循环函数性能：对列表求和的不同实现方式。
 6. 使用命令行工具：通过 `python -m timeit` 进行快速性能测试。
@@ -17,6 +17,22 @@ import random
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 多轮测量的轮数，取其中最小值以过滤系统噪声
+REPEAT = 5
+
+
+def measure_ns(stmt, setup="pass"):
+    """
+    测量 stmt 单次执行的耗时（纳秒）。
+
+    先用 Timer.autorange 找到总耗时不少于 0.2 秒的迭代次数，
+    再以该次数重复测量 REPEAT 轮并取最小值。
+    """
+    timer = timeit.Timer(stmt=stmt, setup=setup, globals=globals())
+    count, _ = timer.autorange()
+    best = min(timer.repeat(repeat=REPEAT, number=count))
+    return best / count * 1e9
+
 
 def basic_timeit_example():
     """
@@ -43,12 +59,10 @@ def incorrect_low_iterations():
 
 def correct_with_normalized_time():
     """
-    示例 3: 正确使用 - 显式指定迭代次数并计算平均耗时
-    运行 100 万次，并计算单次操作的纳秒级耗时。
+    示例 3: 正确使用 - 自动确定迭代次数并计算平均耗时
+    迭代次数由 autorange 根据语句快慢自动选择，结果换算为单次操作的纳秒级耗时。
     """
-    count = 1_000_000
-    delay = timeit.timeit(stmt="1 + 2", number=count)
-    avg_time = (delay / count) * 1e9  # 转换为纳秒
+    avg_time = measure_ns("1 + 2")
     logger.info(f"正确使用 - 单次加法耗时: {avg_time:.2f} 纳秒")
     return avg_time
 
@@ -58,18 +72,14 @@ def setup_separate_initialization():
     示例 4: 使用 setup 分隔初始化逻辑
     测试在 list 中查找值的性能。
     """
-    count = 100_000
-    delay = timeit.timeit(
+    avg_time = measure_ns(
         setup="""
 numbers = list(range(10_000))
 random.shuffle(numbers)
 probe = 7_777
 """,
         stmt="probe in numbers",
-        globals=globals(),
-        number=count,
     )
-    avg_time = (delay / count) * 1e9
     logger.info(f"list 成员查找耗时: {avg_time:.2f} 纳秒")
     return avg_time
 
@@ -79,17 +89,13 @@ def compare_set_vs_list():
     示例 5: 对比 set 和 list 成员查找性能
     使用 setup 替换 list 为 set。
     """
-    count = 100_000
-    delay = timeit.timeit(
+    avg_time = measure_ns(
         setup="""
 numbers = set(range(10_000))
 probe = 7_777
 """,
         stmt="probe in numbers",
-        globals=globals(),
-        number=count,
     )
-    avg_time = (delay / count) * 1e9
     logger.info(f"set 成员查找耗时: {avg_time:.2f} 纳秒")
     return avg_time
 
@@ -107,15 +113,11 @@ def test_loop_sum_performance():
     示例 6: 测试循环求和函数性能
     """
 
-    count = 1000
-    delay = timeit.timeit(
+    avg_time_per_call = measure_ns(
         setup="numbers = list(range(10_000))",
         stmt="loop_sum(numbers)",
-        globals=globals(),
-        number=count,
     )
-    avg_time_per_call = (delay / count) * 1e9
-    avg_time_per_item = (delay / count / 10_000) * 1e9
+    avg_time_per_item = avg_time_per_call / 10_000
     logger.info(f"loop_sum 函数调用耗时: {avg_time_per_call:.2f} 纳秒/次")
     logger.info(f"每个元素耗时: {avg_time_per_item:.2f} 纳秒/元素")
     return avg_time_per_item
@@ -131,7 +133,7 @@ def main():
     logger.info("\n=== 示例 2: 错误使用 - 迭代次数太少 ===")
     incorrect_low_iterations()
 
-    logger.info("\n=== 示例 3: 正确使用 - 显式指定迭代次数并归一化耗时 ===")
+    logger.info("\n=== 示例 3: 正确使用 - 自动确定迭代次数并归一化耗时 ===")
     correct_with_normalized_time()
 
     logger.info("\n=== 示例 4: 使用 setup 分隔初始化逻辑 ===")
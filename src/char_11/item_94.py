@@ -10,6 +10,7 @@ from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import numba
 import ctypes
+import multiprocessing
 import os
 
 # 配置日志记录
@@ -34,10 +35,13 @@ def bad_dot_product(a, b):
 def good_dot_product_with_numpy(a, b):
     """
     使用 NumPy 进行向量化运算，极大提升性能。
+    已经是 ndarray 的输入直接交给 np.dot（BLAS），不再每次调用都复制一份。
     """
-    a_np = np.array(a)
-    b_np = np.array(b)
-    return np.dot(a_np, b_np)
+    if not isinstance(a, np.ndarray):
+        a = np.ascontiguousarray(a, dtype=np.float64)
+    if not isinstance(b, np.ndarray):
+        b = np.ascontiguousarray(b, dtype=np.float64)
+    return np.dot(a, b)
 
 
 # ================================
@@ -54,6 +58,19 @@ def good_dot_product_with_numba(a, b):
     return result
 
 
+@numba.njit("float64(float64[::1], float64[::1])", fastmath=True, cache=True)
+def good_dot_product_with_numba_fastmath(a, b):
+    """
+    允许 fastmath 重排浮点加法，LLVM 可以把循环向量化为 SIMD FMA 指令；
+    cache=True 把编译结果缓存到磁盘，下次运行不必重新编译。
+    显式签名让函数在导入时即完成编译，只接受 C 连续的一维 float64 数组。
+    """
+    result = 0.0
+    for i in range(len(a)):
+        result += a[i] * b[i]
+    return result
+
+
 # ================================
 # 正确示例：使用 ctypes 调用 C 库
 # ================================
@@ -83,8 +100,33 @@ def good_dot_product_with_ctypes(a, b):
 # 错误示例：不合理的线程使用
 # ================================
 def cpu_bound_task(n):
+    # 有意保留解释器循环：它持有 GIL，才能体现线程与进程的差别
     return sum(i ** 2 for i in range(n))
 
+
+def cpu_bound_task_numpy(n):
+    """NumPy 向量化版本：平方和在 C 中用 SIMD 完成（n 较大时会释放 GIL）。"""
+    a = np.arange(n, dtype=np.int64)
+    return int((a * a).sum())
+
+
+@numba.njit(parallel=True, cache=True)
+def cpu_bound_task_numba_parallel(n):
+    """
+    Numba 并行版本：prange 把循环分块交给多个线程执行，编译后的代码不持有 GIL，
+    各线程的部分和由 Numba 自动归约。
+    """
+    total = 0
+    for i in numba.prange(n):
+        total += i * i
+    return total
+
+
+def cpu_bound_task_fast(n):
+    """闭式解：0² + 1² + ... + (n-1)² = n(n-1)(2n-1)/6，O(1)。"""
+    return n * (n - 1) * (2 * n - 1) // 6
+
+
 def bad_parallel_usage():
     """
     在 CPU 密集型任务中使用 threading 模块无法提高性能（受 GIL 影响）。
@@ -111,9 +153,15 @@ def bad_parallel_usage():
 def good_parallel_usage():
     """
     使用 multiprocessing 实现真正的多核并行，绕过 GIL 限制。
+    Numba 的 prange 会在本进程中启动线程池，此后再 fork 子进程可能死锁，
+    因此平台支持时改用 forkserver 创建工作进程。
     """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+    else:
+        context = multiprocessing.get_context()
 
-    with ProcessPoolExecutor() as executor:
+    with ProcessPoolExecutor(mp_context=context) as executor:
         results = list(executor.map(cpu_bound_task, [1000000] * 4))
     return sum(results)
 
@@ -148,17 +196,26 @@ def benchmark_dot_products():
     size = 1000
     a = list(range(size))
     b = list(range(size))
+    # 测试向量只转换一次，NumPy 和 Numba 版本直接使用 ndarray
+    a_np = np.arange(size, dtype=np.float64)
+    b_np = np.arange(size, dtype=np.float64)
 
-    def run_test(func):
-        return timeit.timeit(lambda: func(a, b), number=1000)
+    def run_test(func, x, y):
+        return timeit.timeit(lambda: func(x, y), number=1000)
 
-    bad_time = run_test(bad_dot_product)
-    good_numpy_time = run_test(good_dot_product_with_numpy)
-    good_numba_time = run_test(good_dot_product_with_numba)
+    # 惰性编译的版本先调用一次完成 JIT 编译，避免把编译时间计入基准；
+    # fastmath 版本带显式签名，导入时已编译
+    good_dot_product_with_numba(a_np, b_np)
+
+    bad_time = run_test(bad_dot_product, a, b)
+    good_numpy_time = run_test(good_dot_product_with_numpy, a_np, b_np)
+    good_numba_time = run_test(good_dot_product_with_numba, a_np, b_np)
+    good_fastmath_time = run_test(good_dot_product_with_numba_fastmath, a_np, b_np)
 
     logging.info(f"[性能对比] 纯 Python: {bad_time:.4f}s")
     logging.info(f"[性能对比] NumPy: {good_numpy_time:.4f}s")
     logging.info(f"[性能对比] Numba: {good_numba_time:.4f}s")
+    logging.info(f"[性能对比] Numba fastmath: {good_fastmath_time:.4f}s")
 
 
 # ================================
@@ -173,6 +230,17 @@ def main():
     # 测试点积性能
     benchmark_dot_products()
 
+    # 平方和：解释器循环、NumPy 向量化与闭式解的结果一致
+    n = 1000000
+    expected = cpu_bound_task_fast(n)
+    assert cpu_bound_task(n) == expected
+    assert cpu_bound_task_numpy(n) == expected
+    assert cpu_bound_task_numba_parallel(n) == expected  # 同时完成 JIT 编译，不计入下面的计时
+    logging.info(f"[平方和] 解释器循环: {timeit.timeit(lambda: cpu_bound_task(n), number=1):.6f}s")
+    logging.info(f"[平方和] NumPy: {timeit.timeit(lambda: cpu_bound_task_numpy(n), number=1):.6f}s")
+    logging.info(f"[平方和] Numba prange: {timeit.timeit(lambda: cpu_bound_task_numba_parallel(n), number=1):.6f}s")
+    logging.info(f"[平方和] 闭式解: {timeit.timeit(lambda: cpu_bound_task_fast(n), number=1):.6f}s")
+
     # 内存分析
     check_memory_usage()
 
@@ -15,16 +15,18 @@
 """
 
 import logging
-import random
 import string
 from datetime import datetime, timedelta
 from collections import deque
-from heapq import heappush, heappop
+from heapq import nsmallest
 from bisect import bisect_left
 import pickle
+import timeit
 import copyreg
 from decimal import Decimal, getcontext, ROUND_HALF_UP
-from functools import total_ordering
+from operator import attrgetter
+
+import numpy as np
 
 # 设置日志配置
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -32,22 +34,38 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 # 设置Decimal精度
 getcontext().rounding = ROUND_HALF_UP
 
-@total_ordering
+# 创建时间换算为整数秒时使用的纪元（create_time 为不带时区的UTC时间）
+EPOCH = datetime(1970, 1, 1)
+ONE_SECOND = timedelta(seconds=1)
+
 class Order:
     """订单类，表示一个电商订单"""
 
+    # 十万级订单对象不需要实例 __dict__；amount 是由 cents 换算的属性，不占槽位
+    __slots__ = ('order_id', 'create_time', 'ts', 'cents', 'priority', 'customer')
+
     def __init__(self, order_id, create_time, amount, priority, customer):
         self.order_id = order_id
         self.create_time = create_time  # UTC时间
-        self.amount = amount  # 订单金额（使用Decimal）
+        self.ts = (create_time - EPOCH) // ONE_SECOND  # UTC纪元秒，排序比较时只做整数比较
+        self.cents = int(amount * 100)  # 订单金额，内部以整数分存储，求和、比较都是整数运算
         self.priority = priority  # 订单优先级（数字越小优先级越高）
         self.customer = customer  # 客户名称
 
+    @property
+    def amount(self):
+        """订单金额（Decimal），按需由整数分换算"""
+        return Decimal(self.cents).scaleb(-2)
+
     def __repr__(self):
         return f"Order({self.order_id}, {self.create_time}, {self.amount}, {self.priority}, {self.customer})"
 
     def __lt__(self, other):
-        """根据优先级和创建时间排序"""
+        """
+        根据优先级和创建时间排序
+
+        heapq 只使用 < 比较，因此只定义 __lt__；相等性保持默认的按对象身份比较
+        """
         if not isinstance(other, Order):
             return NotImplemented
 
@@ -55,39 +73,134 @@ class Order:
         if self.priority != other.priority:
             return self.priority < other.priority
 
-        # 如果优先级相同，按创建时间排序
-        return self.create_time < other.create_time
+        # 如果优先级相同，按创建时间排序（比较整数纪元秒而非 datetime 对象）
+        return self.ts < other.ts
 
 
 def generate_random_orders(num=100000):
-    """生成指定数量的随机订单"""
-    orders = []
+    """
+    生成指定数量的随机订单
+
+    各字段的随机数由 NumPy 按列一次性批量生成，最后只用一次列表推导组装 Order 对象
+    """
+    rng = np.random.default_rng()
 
     start_time = datetime(2023, 1, 1)
     end_time = datetime(2023, 12, 31)
+    time_diff = int((end_time - start_time).total_seconds())
+
+    # 随机生成订单ID：按 (num, 10) 下标取字母表中的字符，再按行视为 10 字节字符串
+    alphabet = np.frombuffer((string.ascii_uppercase + string.digits).encode(), dtype='S1')
+    order_ids = alphabet[rng.integers(0, len(alphabet), (num, 10))].view('S10').ravel()
+
+    # 随机生成创建时间，datetime64 数组经 tolist() 转回 datetime 对象
+    seconds = rng.integers(0, time_diff + 1, num).astype('timedelta64[s]')
+    create_times = np.datetime64(start_time, 's') + seconds
+
+    # 随机生成订单金额（保留两位小数，之后转为Decimal保证精度）
+    amounts = np.round(rng.uniform(10, 1000, num), 2)
+
+    # 随机生成优先级（1-5）和客户编号
+    priorities = rng.integers(1, 6, num)
+    customer_ids = rng.integers(1000, 10000, num)
+
+    return [
+        Order(order_id, create_time, Decimal(str(amount)), priority, f"Customer_{customer_id}")
+        for order_id, create_time, amount, priority, customer_id in zip(
+            order_ids.astype('U10').tolist(),
+            create_times.tolist(),
+            amounts.tolist(),
+            priorities.tolist(),
+            customer_ids.tolist(),
+        )
+    ]
+
+
+def order_columns(orders):
+    """
+    把订单列表转换为列式存储（每个字段一个 NumPy 数组）
+
+    下标 i 对应 orders[i]，排序、筛选等可以直接在整数数组上完成
+    """
+    count = len(orders)
+    return {
+        'priority': np.fromiter((order.priority for order in orders), dtype=np.int8, count=count),
+        'ts': np.fromiter((order.ts for order in orders), dtype=np.int64, count=count),
+        'cents': np.fromiter((order.cents for order in orders), dtype=np.int64, count=count),
+    }
+
+
+def priority_order(columns):
+    """
+    返回按优先级、创建时间排序后的下标，与 sorted(orders) 的顺序一致
+
+    np.lexsort 以最后一个键为主键，且排序是稳定的
+    """
+    return np.lexsort((columns['ts'], columns['priority']))
+
 
-    for i in range(num):
-        # 随机生成订单ID
-        order_id = ''.join(random.choices(string.ascii_uppercase + string.digits, k=10))
+def compare_priority_sorting(orders):
+    """对比按 Order.__lt__ 排序对象与在列式数组上 lexsort 的耗时"""
+    columns = order_columns(orders)
+    by_index = [orders[i] for i in priority_order(columns).tolist()]
+    assert all(a is b for a, b in zip(by_index, sorted(orders)))
 
-        # 随机生成创建时间
-        time_diff = (end_time - start_time).total_seconds()
-        random_seconds = random.randint(0, int(time_diff))
-        create_time = start_time + timedelta(seconds=random_seconds)
+    object_time = timeit.timeit(lambda: sorted(orders), number=1)
+    column_time = timeit.timeit(lambda: priority_order(columns), number=1)
+    logging.info(f"按优先级排序订单对象耗时：{object_time:.4f}s，列式 lexsort 耗时：{column_time:.4f}s")
 
-        # 随机生成订单金额（使用Decimal保证精度）
-        amount = Decimal(str(round(random.uniform(10, 1000), 2)))
 
-        # 随机生成优先级（1-5）
-        priority = random.randint(1, 5)
+# 定长二进制记录格式：每个订单占 43 字节，可整批 tobytes()/frombuffer() 序列化
+ORDER_DTYPE = np.dtype([
+    ('order_id', 'S10'),
+    ('ts', '<i8'),
+    ('cents', '<i8'),
+    ('priority', 'i1'),
+    ('customer', 'S16'),
+])
 
-        # 随机生成客户名
-        customer = f"Customer_{random.randint(1000, 9999)}"
 
-        # 创建订单对象
-        orders.append(Order(order_id, create_time, amount, priority, customer))
+def _encode_fixed(values, field):
+    """
+    把字符串编码为 UTF-8，并检查是否能放进 ORDER_DTYPE 中该字段的定长字节
 
-    return orders
+    NumPy 会静默截断过长的字节串，截断的多字节字符之后也无法解码，因此直接拒绝
+    """
+    width = ORDER_DTYPE[field].itemsize
+    encoded = [value.encode() for value in values]
+    if encoded and max(map(len, encoded)) > width:
+        raise ValueError(f"{field} 编码后超过 {width} 字节，无法写入定长记录")
+    return encoded
+
+
+def pack_orders(orders):
+    """
+    把订单整批写入结构化数组，返回其原始字节
+
+    order_id 和 customer 编码为 UTF-8 后分别不能超过 10 和 16 字节，否则抛出 ValueError
+    """
+    records = np.empty(len(orders), dtype=ORDER_DTYPE)
+    records['order_id'] = _encode_fixed((order.order_id for order in orders), 'order_id')
+    records['ts'] = [order.ts for order in orders]
+    records['cents'] = [order.cents for order in orders]
+    records['priority'] = [order.priority for order in orders]
+    records['customer'] = _encode_fixed((order.customer for order in orders), 'customer')
+    return records.tobytes()
+
+
+def unpack_orders(data):
+    """pack_orders 的逆操作：frombuffer 直接解释字节，不复制数据，再逐条组装 Order"""
+    records = np.frombuffer(data, dtype=ORDER_DTYPE)
+    return [
+        Order(order_id.decode(), create_time, Decimal(cents).scaleb(-2), priority, customer.decode())
+        for order_id, create_time, cents, priority, customer in zip(
+            records['order_id'].tolist(),
+            records['ts'].astype('datetime64[s]').tolist(),
+            records['cents'].tolist(),
+            records['priority'].tolist(),
+            records['customer'].tolist(),
+        )
+    ]
 
 
 # 注册pickle序列化函数，维护序列化的可维护性 (Item 107)
@@ -113,74 +226,70 @@ def process_orders(orders):
 
     # 使用key参数按复杂准则排序 (Item 100)
     # 按客户分组排序，然后按金额降序排列
-    orders_by_customer = sorted(orders, key=lambda x: (x.customer, -x.amount))
+    # 利用排序的稳定性分两趟完成：先按金额降序，再按客户升序；
+    # 两趟都用 C 实现的 attrgetter 取键，不必为每个订单调用 Python lambda
+    orders_by_customer = sorted(orders, key=attrgetter('cents'), reverse=True)
+    orders_by_customer.sort(key=attrgetter('customer'))
     logging.info(f"按客户分组并按金额降序排序完成，共{len(orders_by_customer)}个订单")
 
     # 知道sort和sorted的区别 (Item 101)
     # 先使用sorted排序不影响原始数据
-    sorted_by_amount = sorted(orders_by_customer, key=lambda x: x.amount, reverse=True)
+    sorted_by_amount = sorted(orders_by_customer, key=attrgetter('cents'), reverse=True)
     # 再使用sort就地排序，因为后续不再需要原始顺序
-    sorted_by_amount.sort(key=lambda x: x.priority)
+    sorted_by_amount.sort(key=attrgetter('priority'))
     logging.info(f"使用sort和sorted完成最终排序，前5个订单：{sorted_by_amount[:5]}")
 
     # 在有序序列中使用bisect搜索 (Item 102)
     # 假设我们要找出2023年6月1日之后的所有订单
-    sorted_by_time = sorted(sorted_by_amount, key=lambda x: x.create_time)
+    sorted_by_time = sorted(sorted_by_amount, key=attrgetter('create_time'))
     target_date = datetime(2023, 6, 1)
 
-    # 使用bisect找到第一个符合条件的位置
-    index = bisect_left([order.create_time for order in sorted_by_time], target_date)
+    # 使用bisect找到第一个符合条件的位置；key 参数只在二分查找访问到的 O(log n) 个订单上取时间，
+    # 无需先构建整个创建时间列表
+    index = bisect_left(sorted_by_time, target_date, key=attrgetter('create_time'))
     recent_orders = sorted_by_time[index:]
     logging.info(f"使用bisect找到{target_date}之后的订单{len(recent_orders)}个")
 
     # 使用deque实现生产者-消费者队列 (Item 103)
-    # 创建两个队列：待处理和已完成
+    # 创建两个队列：待处理和已完成；队列中存放订单在 batch/batch_columns 中的下标
+    batch = recent_orders[:100]  # 只处理前100个最近订单
+    batch_columns = order_columns(batch)
     to_process_queue = deque()
     processed_queue = deque()
 
-    # 生产者：将最近的订单加入队列
-    for order in recent_orders[:100]:  # 只处理前100个最近订单
-        to_process_queue.append(order)
+    # 生产者：将最近订单的下标加入队列
+    for i in range(len(batch)):
+        to_process_queue.append(i)
 
     # 消费者：处理订单
     while to_process_queue:
-        order = to_process_queue.popleft()
+        i = to_process_queue.popleft()
         # 处理订单（这里只是简单标记为已处理）
-        processed_queue.append(order)
+        processed_queue.append(i)
     logging.info(f"通过deque处理了{len(processed_queue)}个订单")
+    processed_indices = list(processed_queue)
+    processed_orders = [batch[i] for i in processed_indices]
 
     # 使用heapq实现优先队列 (Item 104)
-    # 将剩余订单放入优先队列，按照优先级处理
+    # 只需要剩余订单中优先级最高的 50 个：nsmallest 内部只维护大小为 50 的堆，
+    # 不必把全部订单压入堆后再逐个弹出
     remaining_orders = recent_orders[100:]
-    priority_queue = []
-
-    for order in remaining_orders:
-        heappush(priority_queue, order)
-
-    # 处理高优先级订单
-    high_priority_orders = []
-    while priority_queue and len(high_priority_orders) < 50:
-        order = heappop(priority_queue)
-        high_priority_orders.append(order)
+    high_priority_orders = nsmallest(50, remaining_orders)
 
     logging.info(f"使用heapq处理了{len(high_priority_orders)}个高优先级订单，前5个：{high_priority_orders[:5]}")
 
     # 使用datetime处理本地时钟 (Item 105)
-    # 将UTC时间转换为北京时间
-    beijing_tz = timedelta(hours=8)
-    local_orders = []
-
-    for order in high_priority_orders:
-        local_time = order.create_time + beijing_tz
-        local_orders.append((order, local_time))
+    # 将UTC时间转换为北京时间：先在整数纪元秒上加偏移，只为要展示的订单构造datetime
+    beijing_offset = 8 * 3600
+    local_orders = [(order, order.ts + beijing_offset) for order in high_priority_orders]
 
-    logging.info(f"转换了{len(local_orders)}个订单的UTC时间为北京时间，前5个：{local_orders[:5]}")
+    shown = [(order, EPOCH + timedelta(seconds=local_ts)) for order, local_ts in local_orders[:5]]
+    logging.info(f"转换了{len(local_orders)}个订单的UTC时间为北京时间，前5个：{shown}")
 
     # 使用decimal确保精确计算 (Item 106)
-    # 计算总销售额
-    total_sales = Decimal('0')
-    for order in processed_queue:
-        total_sales += order.amount
+    # 计算总销售额：先对整数分求和，只在最后换算一次Decimal
+    total_cents = int(batch_columns['cents'][processed_indices].sum())
+    total_sales = Decimal(total_cents).scaleb(-2)
 
     avg_sales = total_sales / len(processed_queue) if processed_queue else Decimal('0')
 
@@ -188,11 +297,17 @@ def process_orders(orders):
     logging.info(f"平均订单金额：{avg_sales.quantize(Decimal('0.00'))}")
 
     # 使用pickle序列化处理过的订单 (Item 107)
-    serialized_data = pickle.dumps(list(processed_queue))
+    serialized_data = pickle.dumps(processed_orders)
     deserialized_orders = pickle.loads(serialized_data)
 
     logging.info(f"使用copyreg维护pickle序列化，反序列化得到{len(deserialized_orders)}个订单")
 
+    # 不需要版本兼容的内部传输可改用定长二进制记录，体积更小，读取时整批解释
+    packed_data = pack_orders(processed_orders)
+    unpacked_orders = unpack_orders(packed_data)
+    assert [repr(order) for order in unpacked_orders] == [repr(order) for order in deserialized_orders]
+    logging.info(f"pickle数据{len(serialized_data)}字节，定长二进制记录{len(packed_data)}字节")
+
     logging.info("订单处理完成")
     return deserialized_orders
 
@@ -205,6 +320,9 @@ def main():
         orders = generate_random_orders(100000)
         logging.info(f"成功生成{len(orders)}个订单数据")
 
+        # 对比对象排序与列式排序
+        compare_priority_sorting(orders)
+
         # 处理订单
         processed_orders = process_orders(orders)
 
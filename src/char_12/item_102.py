@@ -6,6 +6,7 @@ bisect模块示例演示
 - 与线性查找(index方法)进行性能对比
 - 在非精确匹配场景下的应用
 - 错误使用示例及正确用法对比
+- 批量查询时使用NumPy的searchsorted一次完成所有二分查找
 """
 
 import bisect
@@ -13,6 +14,8 @@ import logging
 import timeit
 import random
 
+import numpy as np
+
 # 配置日志记录
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -136,6 +139,34 @@ def find_closest_value_wrong_approach():
     index = find_closest(data, 91234.56)
     logger.info(f"使用简单实现找到最接近值91234.56，位置为：{index}")
 
+def find_closest(sequence, goal):
+    """使用bisect_left并比较相邻元素，返回有序序列中最接近goal的位置"""
+    index = bisect.bisect_left(sequence, goal)
+    if index == 0:
+        return 0
+    if index == len(sequence):
+        return len(sequence) - 1
+    before = sequence[index - 1]
+    after = sequence[index] if index < len(sequence) else float('inf')
+    if after - goal < goal - before:
+        return index
+    else:
+        return index - 1
+
+def find_closest_batch(array, goals):
+    """
+    find_closest的批量版本
+
+    np.searchsorted在C循环中一次完成全部二分查找，
+    相邻元素的比较也用数组运算完成，结果与逐个调用find_closest一致
+    """
+    index = np.searchsorted(array, goals, side='left')
+    before_index = np.clip(index - 1, 0, len(array) - 1)
+    after_index = np.minimum(index, len(array) - 1)
+    before = array[before_index]
+    after = array[after_index]
+    return np.where(after - goals < goals - before, after_index, before_index)
+
 def find_closest_value_correct_approach():
     """
     寻找最接近值的正确实现示例
@@ -143,23 +174,31 @@ def find_closest_value_correct_approach():
     演示了如何正确实现寻找最接近值的功能
     使用bisect_left并检查相邻元素来找到最接近值
     """
-    def find_closest(sequence, goal):
-        index = bisect.bisect_left(sequence, goal)
-        if index == 0:
-            return 0
-        if index == len(sequence):
-            return len(sequence) - 1
-        before = sequence[index - 1]
-        after = sequence[index] if index < len(sequence) else float('inf')
-        if after - goal < goal - before:
-            return index
-        else:
-            return index - 1
-
     data = list(range(10**5))
     index = find_closest(data, 91234.56)
     logger.info(f"使用bisect找到最接近值91234.56，最接近的位置为：{index}")
 
+def find_closest_values_batch():
+    """
+    批量寻找最接近值示例
+
+    有大量查询值时，先把有序数据转换为NumPy数组，
+    再用find_closest_batch一次处理整批查询，并与逐个bisect的结果和耗时对比
+    """
+    size = 10**5
+    data = list(range(size))
+    array = np.asarray(data, dtype=np.int64)
+    goals = np.random.default_rng().uniform(-10, size + 10, 10_000)
+    goal_list = goals.tolist()
+
+    batch = find_closest_batch(array, goals)
+    assert batch.tolist() == [find_closest(data, goal) for goal in goal_list]
+
+    loop_time = timeit.timeit(lambda: [find_closest(data, goal) for goal in goal_list], number=10) / 10
+    batch_time = timeit.timeit(lambda: find_closest_batch(array, goals), number=10) / 10
+    logger.info(f"逐个bisect查询{len(goal_list)}个值耗时: {loop_time:.6f}s")
+    logger.info(f"searchsorted批量查询耗时: {batch_time:.6f}s")
+
 def main():
     """主函数 - 运行所有示例"""
     logger.info("开始运行线性搜索示例")
@@ -189,5 +228,8 @@ def main():
     logger.info("\n开始运行寻找最接近值正确实现示例")
     find_closest_value_correct_approach()
 
+    logger.info("\n开始运行批量寻找最接近值示例")
+    find_closest_values_batch()
+
 if __name__ == "__main__":
     main()